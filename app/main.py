@@ -1,19 +1,48 @@
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI
-from app.routers import users, events, health, ticket, organiser
+from app.routers import users, events, health, ticket, organiser, metrics, batch
 from app.middleware.logging import LoggingMiddleware
 from app.middleware.auth import AuthMiddleware
+from app.middleware.context import RequestContextMiddleware
+from app.middleware.deadline import DeadlineMiddleware
+from app.middleware.idempotency import IdempotencyMiddleware
 from fastapi.middleware.cors import CORSMiddleware
+from app.services.composite_service import CompositeService
 from app.utils.config import Config
 import uvicorn
 
 config = Config()
 
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """
+    Creates the shared CompositeService (and its upstream connection pools) on startup
+    and drains it on shutdown. Refuses to start without a JWT secret.
+    """
+    if not config.JWT_SECRET_KEY:
+        raise RuntimeError("JWT_SECRET_KEY must be set")
+    app.state.composite_service = CompositeService()
+    await app.state.composite_service.start()
+    try:
+        yield
+    finally:
+        await app.state.composite_service.close()
+
 app = FastAPI(
     title="Composite Service",
     description="The Composite API acts as a gateway between the UI and all underlying microservices (User, Event, Ticket). It validates JWT, orchestrates calls, and provides a unified interface.",
-    version="1.0.0"
+    version="1.0.0",
+    lifespan=lifespan
 )
 
+#Middleware added last runs first: CORS wraps everything so auth failures still carry CORS headers.
+#Idempotency runs inside auth so keys are scoped to the verified caller.
+app.add_middleware(IdempotencyMiddleware)
+app.add_middleware(AuthMiddleware)
+app.add_middleware(DeadlineMiddleware)
+app.add_middleware(LoggingMiddleware)
+app.add_middleware(RequestContextMiddleware)
 app.add_middleware(
     CORSMiddleware,
     allow_origins=['*'],
@@ -22,14 +51,13 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-app.add_middleware(LoggingMiddleware)
-app.add_middleware(AuthMiddleware)
-
 app.include_router(users.router)
 app.include_router(organiser.router)
 app.include_router(events.router)
 app.include_router(ticket.router)
 app.include_router(health.router)
+app.include_router(metrics.router)
+app.include_router(batch.router)
 
 @app.get("/", tags=["root"])
 async def read_root():
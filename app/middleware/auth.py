@@ -1,29 +1,51 @@
-from fastapi import HTTPException, Request
-from starlette.middleware.base import BaseHTTPMiddleware
-from starlette.responses import Response
-from jose import jwt, JWTError
-import os
+from starlette.datastructures import Headers
+from starlette.responses import JSONResponse
+from starlette.types import ASGIApp, Receive, Scope, Send
+from jwt import ExpiredSignatureError, InvalidTokenError
 
-JWT_SECRET_KEY = os.getenv("JWT_SECRET_KEY", "myjwtsecret")
-JWT_ALGORITHM = "HS256"
+from app.utils.auth import token_verifier
 
-EXCLUDE_PATHS = ["/", "/composite/health"]
+#Paths served without a token. EXCLUDE_PATHS match exactly, EXCLUDE_PREFIXES match any sub-path.
+EXCLUDE_PATHS = ["/", "/openapi.json"]
+EXCLUDE_PREFIXES = ["/composite/health", "/composite/metrics", "/docs", "/redoc"]
 
-class AuthMiddleware(BaseHTTPMiddleware):
-    async def dispatch(self, request: Request, call_next):
-        if any(request.url.path.startswith(p) for p in EXCLUDE_PATHS):
-            return await call_next(request)
+def is_excluded(path: str) -> bool:
+    return path in EXCLUDE_PATHS or any(path.startswith(p) for p in EXCLUDE_PREFIXES)
 
-        auth_header = request.headers.get("Authorization")
+class AuthMiddleware:
+    """
+    The single auth stage: verifies the bearer token once and stores the token,
+    its claims and profile on request.state for the handlers to reuse.
+    """
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http" or scope["method"] == "OPTIONS" or is_excluded(scope["path"]):
+            await self.app(scope, receive, send)
+            return
+
+        auth_header = Headers(scope=scope).get("authorization")
         if not auth_header or not auth_header.startswith("Bearer "):
-            raise HTTPException(status_code=401, detail="Missing or invalid Authorization header")
+            response = JSONResponse(status_code=401, content={"detail": "Missing or invalid Authorization header"})
+            await response(scope, receive, send)
+            return
 
         token = auth_header.split(" ", 1)[1]
 
         try:
-            jwt.decode(token, JWT_SECRET_KEY, algorithms=[JWT_ALGORITHM])
-        except JWTError:
-            raise HTTPException(status_code=401, detail="Invalid token")
+            claims = token_verifier.verify(token)
+        except ExpiredSignatureError:
+            response = JSONResponse(status_code=401, content={"detail": "The auth token has expired"})
+            await response(scope, receive, send)
+            return
+        except InvalidTokenError:
+            response = JSONResponse(status_code=401, content={"detail": "Invalid token"})
+            await response(scope, receive, send)
+            return
 
-        request.state.token = token
-        return await call_next(request)
+        state = scope.setdefault("state", {})
+        state["token"] = token
+        state["claims"] = claims
+        state["profile"] = claims.get('profile')
+        await self.app(scope, receive, send)
@@ -0,0 +1,34 @@
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.utils.request_context import RequestContext, reset_context, set_context
+
+
+class RequestContextMiddleware:
+    """
+    Opens a RequestContext for every HTTP request and, when the response starts,
+    adds a Server-Timing header plus any headers the handlers queued on the context.
+    """
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        context = RequestContext()
+        token = set_context(context)
+
+        async def send_with_headers(message: Message):
+            if message["type"] == "http.response.start":
+                headers = MutableHeaders(scope=message)
+                for name, value in context.response_headers.items():
+                    headers[name] = value
+                headers.append("Server-Timing", context.server_timing())
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_headers)
+        finally:
+            reset_context(token)
@@ -0,0 +1,123 @@
+import asyncio
+import time
+
+from starlette.datastructures import Headers
+from starlette.responses import JSONResponse
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.utils.config import Config
+from app.utils.request_context import DEADLINE_HEADER, reset_deadline, set_deadline
+
+config = Config()
+
+def resolve_budget(scope: Scope) -> float:
+    """
+    Budget in seconds for this request: the longest matching ROUTE_DEADLINES prefix or
+    REQUEST_DEADLINE_SECONDS, shortened by the client's X-Request-Timeout (ms) if given.
+    """
+    path = scope["path"]
+    budget = config.REQUEST_DEADLINE_SECONDS
+    matches = [prefix for prefix in config.ROUTE_DEADLINES if path.startswith(prefix)]
+    if matches:
+        budget = float(config.ROUTE_DEADLINES[max(matches, key=len)])
+
+    requested = Headers(scope=scope).get(DEADLINE_HEADER)
+    if requested:
+        try:
+            budget = min(budget, max(float(requested) / 1000, 0.0))
+        except ValueError:
+            pass
+    return budget
+
+class DeadlineMiddleware:
+    """
+    Gives every request a deadline that CompositeService turns into upstream timeouts.
+
+    The handler runs as a separate task so it can be cancelled when the client
+    disconnects, or when the deadline (plus DEADLINE_GRACE_SECONDS) passes before a
+    response has started, in which case a 504 is sent. Once the response is complete,
+    background tasks keep running without a deadline.
+    """
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        budget = resolve_budget(scope)
+        deadline = time.monotonic() + budget
+
+        # Buffer the (small JSON) request body so the disconnect watcher can own `receive`.
+        body = b""
+        more_body = True
+        while more_body:
+            message = await receive()
+            if message["type"] == "http.disconnect":
+                return
+            body += message.get("body", b"")
+            more_body = message.get("more_body", False)
+
+        disconnected = asyncio.Event()
+        response_complete = asyncio.Event()
+        response_started = False
+        body_sent = False
+
+        async def replay_receive() -> Message:
+            nonlocal body_sent
+            if not body_sent:
+                body_sent = True
+                return {"type": "http.request", "body": body, "more_body": False}
+            await disconnected.wait()
+            return {"type": "http.disconnect"}
+
+        async def tracking_send(message: Message):
+            nonlocal response_started
+            if message["type"] == "http.response.start":
+                response_started = True
+            elif message["type"] == "http.response.body" and not message.get("more_body", False):
+                response_complete.set()
+            await send(message)
+
+        async def watch_disconnect():
+            while True:
+                message = await receive()
+                if message["type"] == "http.disconnect":
+                    disconnected.set()
+                    return
+
+        token = set_deadline(deadline)
+        try:
+            app_task = asyncio.ensure_future(self.app(scope, replay_receive, tracking_send))
+        finally:
+            reset_deadline(token)
+        watcher = asyncio.ensure_future(watch_disconnect())
+        completion = asyncio.ensure_future(response_complete.wait())
+
+        try:
+            timeout = deadline + config.DEADLINE_GRACE_SECONDS - time.monotonic()
+            done, _ = await asyncio.wait(
+                {app_task, watcher, completion}, timeout=max(timeout, 0), return_when=asyncio.FIRST_COMPLETED
+            )
+            if app_task in done or response_complete.is_set() or response_started:
+                await app_task
+            elif watcher in done:
+                await self._cancel(app_task)
+            else:
+                await self._cancel(app_task)
+                response = JSONResponse(status_code=504, content={"detail": "Request deadline exceeded"})
+                await response(scope, replay_receive, send)
+        finally:
+            if not app_task.done():
+                app_task.cancel()
+            watcher.cancel()
+            completion.cancel()
+
+    @staticmethod
+    async def _cancel(task: asyncio.Task):
+        task.cancel()
+        try:
+            await task
+        except asyncio.CancelledError:
+            pass
@@ -0,0 +1,216 @@
+import asyncio
+import hashlib
+import time
+from collections import OrderedDict
+from typing import List, Optional, Tuple
+
+from starlette.datastructures import Headers
+from starlette.responses import JSONResponse
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.middleware.logging import logger
+from app.utils.config import Config
+
+config = Config()
+
+IDEMPOTENCY_HEADER = "Idempotency-Key"
+#POST routes whose retries must not repeat the upstream write (bookings and creations).
+IDEMPOTENT_PATHS = ["/composite/ticket/", "/composite/events", "/composite/user/", "/composite/organiser/"]
+MAX_KEY_LENGTH = 255
+
+
+class IdempotencyRecord:
+    __slots__ = ("fingerprint", "done", "status", "headers", "body", "expires_at")
+
+    def __init__(self, fingerprint: str):
+        self.fingerprint = fingerprint
+        self.done = asyncio.Event()
+        self.status: Optional[int] = None
+        self.headers: List[Tuple[bytes, bytes]] = []
+        self.body = b""
+        self.expires_at: Optional[float] = None
+
+    @property
+    def completed(self) -> bool:
+        return self.expires_at is not None
+
+
+class IdempotencyStore:
+    """
+    Bounded store of in-flight and completed idempotent requests. Completed records
+    expire `ttl` seconds after they finish; beyond `max_size`, the oldest completed
+    records are evicted first.
+    """
+
+    def __init__(self, max_size: int, ttl: float):
+        self.max_size = max_size
+        self.ttl = ttl
+        self._records: "OrderedDict[tuple, IdempotencyRecord]" = OrderedDict()
+        self.replayed = 0
+
+    def get(self, key: tuple) -> Optional[IdempotencyRecord]:
+        record = self._records.get(key)
+        if record is not None and record.completed and record.expires_at <= time.monotonic():
+            del self._records[key]
+            return None
+        return record
+
+    def begin(self, key: tuple, fingerprint: str) -> IdempotencyRecord:
+        record = self._records[key] = IdempotencyRecord(fingerprint)
+        return record
+
+    def complete(self, key: tuple, record: IdempotencyRecord):
+        record.expires_at = time.monotonic() + self.ttl
+        self._records.move_to_end(key)
+        excess = len(self._records) - self.max_size
+        if excess > 0:
+            for old_key in [old_key for old_key, old in self._records.items() if old.completed][:excess]:
+                del self._records[old_key]
+        record.done.set()
+
+    def discard(self, key: tuple, record: IdempotencyRecord):
+        if self._records.get(key) is record:
+            del self._records[key]
+        record.done.set()
+
+    def stats(self) -> dict:
+        return {"size": len(self._records), "replayed": self.replayed}
+
+
+idempotency_store = IdempotencyStore(config.IDEMPOTENCY_STORE_SIZE, config.IDEMPOTENCY_TTL)
+
+#Keyed attempts still running after their caller went away.
+_running = set()
+
+
+class IdempotencyMiddleware:
+    """
+    Honours Idempotency-Key on POSTs to IDEMPOTENT_PATHS. Sits inside AuthMiddleware
+    so keys are scoped to the caller.
+
+    The first request with a key runs normally and its response is stored; retries
+    with the same key and body get that response replayed byte-for-byte with
+    `Idempotent-Replayed: true`, and retries arriving while it is still running wait
+    for it. Reusing a key with a different body is a 422. 5xx responses and failed
+    attempts are not stored, so a retry after them runs again. An attempt whose
+    client disconnects or whose deadline passes still runs to completion.
+    """
+    def __init__(self, app: ASGIApp, store: Optional[IdempotencyStore] = None):
+        self.app = app
+        self.store = store or idempotency_store
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http" or scope["method"] != "POST" or scope["path"] not in IDEMPOTENT_PATHS:
+            await self.app(scope, receive, send)
+            return
+        idempotency_key = Headers(scope=scope).get(IDEMPOTENCY_HEADER)
+        claims = scope.get("state", {}).get("claims")
+        if idempotency_key is None or claims is None:
+            await self.app(scope, receive, send)
+            return
+        if not idempotency_key or len(idempotency_key) > MAX_KEY_LENGTH:
+            response = JSONResponse(status_code=400, content={"detail": f"{IDEMPOTENCY_HEADER} must be 1-{MAX_KEY_LENGTH} characters"})
+            await response(scope, receive, send)
+            return
+
+        body = b""
+        more_body = True
+        while more_body:
+            message = await receive()
+            if message["type"] == "http.disconnect":
+                return
+            body += message.get("body", b"")
+            more_body = message.get("more_body", False)
+
+        principal = claims.get("email") or hashlib.sha256(scope["state"]["token"].encode()).hexdigest()
+        key = (principal, scope["method"], scope["path"], idempotency_key)
+        fingerprint = hashlib.blake2b(scope["query_string"] + b"\n" + body, digest_size=16).hexdigest()
+
+        while True:
+            record = self.store.get(key)
+            if record is None:
+                break
+            if record.fingerprint != fingerprint:
+                response = JSONResponse(
+                    status_code=422,
+                    content={"detail": f"{IDEMPOTENCY_HEADER} was already used with a different request"},
+                )
+                await response(scope, receive, send)
+                return
+            if record.completed:
+                await self._replay(record, send)
+                return
+            # Another attempt with this key is in flight: wait for it, then replay or retry.
+            await record.done.wait()
+
+        record = self.store.begin(key, fingerprint)
+        await self._execute(scope, body, receive, send, key, record)
+
+    async def _execute(self, scope: Scope, body: bytes, receive: Receive, send: Send,
+                       key: tuple, record: IdempotencyRecord):
+        """
+        Runs the first attempt with a key in its own task. If the caller goes away
+        (client disconnect or deadline cancellation), the task still finishes the
+        write and stores its response, so a retry replays it instead of repeating it.
+        """
+        attached = True
+        body_sent = False
+        chunks = []
+        complete = False
+
+        async def replay_receive() -> Message:
+            nonlocal body_sent
+            if not body_sent:
+                body_sent = True
+                return {"type": "http.request", "body": body, "more_body": False}
+            return await receive()
+
+        async def recording_send(message: Message):
+            nonlocal attached, complete
+            if message["type"] == "http.response.start":
+                record.status = message["status"]
+                record.headers = list(message.get("headers", []))
+            elif message["type"] == "http.response.body":
+                chunks.append(message.get("body", b""))
+                complete = not message.get("more_body", False)
+            if attached:
+                try:
+                    await send(message)
+                except Exception:
+                    # The client is gone; keep recording so the retry can be replayed.
+                    attached = False
+
+        async def run():
+            try:
+                await self.app(scope, replay_receive, recording_send)
+            finally:
+                if complete and record.status is not None and record.status < 500:
+                    record.body = b"".join(chunks)
+                    self.store.complete(key, record)
+                else:
+                    self.store.discard(key, record)
+
+        def finished(task: asyncio.Task):
+            _running.discard(task)
+            if not attached and not task.cancelled() and task.exception() is not None:
+                logger.error("Idempotent request failed after its client left", extra={"fields": {
+                    "method": scope["method"], "path": scope["path"], "error": str(task.exception()),
+                }})
+
+        task = asyncio.ensure_future(run())
+        _running.add(task)
+        task.add_done_callback(finished)
+        try:
+            await asyncio.shield(task)
+        except asyncio.CancelledError:
+            attached = False
+            raise
+
+    async def _replay(self, record: IdempotencyRecord, send: Send):
+        self.store.replayed += 1
+        await send({
+            "type": "http.response.start",
+            "status": record.status,
+            "headers": record.headers + [(b"idempotent-replayed", b"true")],
+        })
+        await send({"type": "http.response.body", "body": record.body})
@@ -1,47 +1,129 @@
+import atexit
+import json
 import logging
+import queue
+import random
 import time
-from starlette.middleware.base import BaseHTTPMiddleware
-from starlette.requests import Request
-from starlette.responses import Response
+from datetime import datetime, timezone
+from logging.handlers import QueueHandler, QueueListener
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.utils.config import Config
+
+config = Config()
+
+class JSONFormatter(logging.Formatter):
+    """
+    Formats a record as one JSON object; fields passed as extra={"fields": {...}} are merged in.
+    """
+    def format(self, record: logging.LogRecord) -> str:
+        payload = {
+            "timestamp": datetime.fromtimestamp(record.created, tz=timezone.utc).isoformat(),
+            "level": record.levelname,
+            "message": record.getMessage(),
+        }
+        payload.update(getattr(record, "fields", {}))
+        if record.exc_info:
+            payload["exception"] = self.formatException(record.exc_info)
+        return json.dumps(payload, default=str)
+
+class BoundedQueueHandler(QueueHandler):
+    """
+    Hands records to the background listener without formatting them on the caller's
+    thread, and counts the records dropped when the queue is full instead of blocking.
+    """
+    def __init__(self, log_queue: queue.Queue):
+        super().__init__(log_queue)
+        self.dropped = 0
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        return record
+
+    def enqueue(self, record: logging.LogRecord):
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
 
 #Configuring the logger
 logger = logging.getLogger("composite_service_logger")
 logger.setLevel(logging.INFO)
 
-#Creating console handler with a higher log level
+#Creating console handler; it runs on the listener thread, off the event loop
 console_handler = logging.StreamHandler()
 console_handler.setLevel(logging.INFO)
+console_handler.setFormatter(JSONFormatter())
 
-#Creating formatter and add it to the handlers
-formatter = logging.Formatter(
-    "%(asctime)s - %(levelname)s - %(message)s"
-)
-console_handler.setFormatter(formatter)
+#Routing records through a bounded queue drained by a background listener
+log_queue: queue.Queue = queue.Queue(maxsize=config.LOG_QUEUE_SIZE)
+queue_handler = BoundedQueueHandler(log_queue)
+log_listener = QueueListener(log_queue, console_handler, respect_handler_level=True)
 
-#Adding the handlers to the logger
 if not logger.handlers:
-    logger.addHandler(console_handler)
+    logger.addHandler(queue_handler)
+    log_listener.start()
+    atexit.register(log_listener.stop)
 
-class LoggingMiddleware(BaseHTTPMiddleware):
-    async def dispatch(self, request: Request, call_next):
-        start_time = time.time()
-        method = request.method
-        url = request.url.path
-        client_host = request.client.host
+class LoggingMiddleware:
+    """
+    Emits one structured record per request, timed until the last body chunk is sent
+    so background tasks do not count. Successful requests are sampled at
+    LOG_SAMPLE_RATE; errors and requests slower than LOG_SLOW_REQUEST_MS are always logged.
+    """
+    def __init__(self, app: ASGIApp):
+        self.app = app
 
-        logger.info(f"Incoming request: {method} {url} from {client_host}")
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        start_time = time.monotonic()
+        client = scope.get("client")
+        fields = {
+            "method": scope["method"],
+            "path": scope["path"],
+            "client": client[0] if client else None,
+        }
+        status_code = 500
+        logged = False
+
+        def log_request():
+            nonlocal logged
+            logged = True
+            process_time = (time.monotonic() - start_time) * 1000
+            fields["status"] = status_code
+            fields["duration_ms"] = round(process_time, 2)
+
+            if status_code >= 500:
+                logger.error("Request failed", extra={"fields": fields})
+            elif status_code >= 400:
+                logger.warning("Request rejected", extra={"fields": fields})
+            elif process_time >= config.LOG_SLOW_REQUEST_MS:
+                logger.warning("Slow request", extra={"fields": fields})
+            elif config.LOG_SAMPLE_RATE >= 1.0 or random.random() < config.LOG_SAMPLE_RATE:
+                logger.info("Request completed", extra={"fields": fields})
+
+        async def send_with_status(message: Message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+            # Timed to the last body chunk: background tasks that run after the
+            # response (e.g. attendee notifications) are not part of the request.
+            if message["type"] == "http.response.body" and not message.get("more_body", False) and not logged:
+                log_request()
 
         try:
-            response: Response = await call_next(request)
+            await self.app(scope, receive, send_with_status)
         except Exception as e:
-            logger.error(f"Error processing request: {e}")
+            if logged:
+                logger.error("Background task failed", extra={"fields": dict(fields, error=str(e))})
+                raise e
+            fields["duration_ms"] = round((time.monotonic() - start_time) * 1000, 2)
+            fields["error"] = str(e)
+            logger.error("Error processing request", extra={"fields": fields})
             raise e
 
-        process_time = (time.time() - start_time) * 1000
-        status_code = response.status_code
-
-        logger.info(
-            f"Response: {status_code} for {method} {url} in {process_time:.2f}ms"
-        )
-
-        return response
+        if not logged:
+            log_request()
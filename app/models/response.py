@@ -1,5 +1,13 @@
+import json
+import httpx
 from pydantic import BaseModel, HttpUrl
-from typing import List, Optional, Any
+from starlette.responses import JSONResponse, StreamingResponse
+from typing import AsyncIterator, List, Optional, Any, Tuple
+
+try:
+    import orjson
+except ImportError:  # orjson is optional; HATEOASJSONResponse falls back to json
+    orjson = None
 
 class HATEOASLink(BaseModel):
     rel: str
@@ -10,3 +18,79 @@ class HATEOASResponse(BaseModel):
     data: Optional[Any] = None
     message: Optional[str] = None
     links: List[HATEOASLink] = []
+
+
+class LinkTemplate:
+    """
+    The links of one route, formatted once per response without building HATEOASLink models.
+    """
+
+    __slots__ = ("templates",)
+
+    def __init__(self, *templates: Tuple[str, str, str]):
+        self.templates = templates
+
+    def render(self, **params) -> List[dict]:
+        return [
+            {"rel": rel, "href": href.format(**params), "method": method}
+            for rel, href, method in self.templates
+        ]
+
+
+def hateoas_envelope(data: Any, message: str, links: List[dict]) -> dict:
+    """
+    The HATEOASResponse shape as a plain dict; `data` is passed through unvalidated.
+    """
+    return {"data": data, "message": message, "links": links}
+
+
+def dumps(content: Any) -> bytes:
+    if orjson is not None:
+        return orjson.dumps(content, option=orjson.OPT_NON_STR_KEYS)
+    return json.dumps(content, ensure_ascii=False, allow_nan=False, separators=(",", ":")).encode("utf-8")
+
+
+class HATEOASJSONResponse(JSONResponse):
+    """
+    Renders a hateoas_envelope() with orjson when it is installed. Routes that return
+    it skip FastAPI's response_model validation and jsonable_encoder pass, which is
+    where large event and attendee lists spent their time.
+    """
+
+    def render(self, content: Any) -> bytes:
+        return dumps(content)
+
+
+class HATEOASStreamingResponse(StreamingResponse):
+    """
+    Relays a streamed upstream JSON body as the `data` of a HATEOAS envelope without
+    parsing it: the envelope is written around the raw chunks and the links are also
+    sent as Link headers. The upstream response is closed once the response has been
+    sent or abandoned, whether or not the body was iterated.
+    """
+
+    def __init__(self, upstream: httpx.Response, message: str, links: List[dict]):
+        self.upstream = upstream
+        # `,"message":...,"links":[...]}` closes the envelope after the raw data.
+        self._suffix = b"," + dumps({"message": message, "links": links})[1:]
+        headers = {"Link": ", ".join(f'<{link["href"]}>; rel="{link["rel"]}"' for link in links)} if links else None
+        super().__init__(self._body(), media_type="application/json", headers=headers)
+
+    async def __call__(self, scope, receive, send):
+        # Closed here rather than in _body(): if the client goes away before the body
+        # is iterated, the generator never starts and its cleanup would never run.
+        try:
+            await super().__call__(scope, receive, send)
+        finally:
+            await self.upstream.aclose()
+
+    async def _body(self) -> AsyncIterator[bytes]:
+        yield b'{"data":'
+        empty = True
+        async for chunk in self.upstream.aiter_raw():
+            if chunk:
+                empty = False
+                yield chunk
+        if empty:
+            yield b"null"
+        yield self._suffix
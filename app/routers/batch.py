@@ -0,0 +1,183 @@
+import asyncio
+import json
+from typing import Any, Dict, List, Optional
+from urllib.parse import urlsplit
+
+from fastapi import APIRouter, Depends, HTTPException, Request
+from pydantic import BaseModel
+from starlette.exceptions import HTTPException as StarletteHTTPException
+from starlette.types import Message
+
+from app.middleware.idempotency import IdempotencyMiddleware
+from app.middleware.logging import logger
+from app.models.response import HATEOASJSONResponse, HATEOASResponse, hateoas_envelope
+from app.utils.config import Config
+from app.utils.dependencies import get_claims
+from app.utils.request_context import RequestContext, reset_batch_memo, set_batch_memo, set_context
+
+config = Config()
+
+router = APIRouter(prefix="/composite/batch", tags=["composite_batch"])
+
+BATCH_METHODS = ("GET", "POST", "PUT", "PATCH", "DELETE")
+#Request headers a sub-request may set for itself; everything else comes from the batch request.
+SUB_REQUEST_HEADERS = ("if-none-match", "idempotency-key")
+
+
+class BatchItem(BaseModel):
+    id: Optional[str] = None
+    method: str = "GET"
+    path: str
+    body: Optional[Any] = None
+    headers: Dict[str, str] = {}
+
+
+class BatchRequest(BaseModel):
+    requests: List[BatchItem]
+
+
+#Sub-requests whose background tasks are still running after their response was collected.
+_detached = set()
+
+
+def _background_done(task: asyncio.Task):
+    _detached.discard(task)
+    if not task.cancelled() and task.exception() is not None:
+        logger.error("Batch sub-request background task failed", extra={"fields": {"error": str(task.exception())}})
+
+
+def _validate(item: BatchItem):
+    if item.method.upper() not in BATCH_METHODS:
+        raise HTTPException(status_code=400, detail=f"Unsupported method in batch: {item.method}")
+    if not item.path.startswith("/composite/") or item.path.startswith(router.prefix):
+        raise HTTPException(status_code=400, detail=f"Batch paths must be composite routes: {item.path}")
+
+
+def _sub_scope(request: Request, item: BatchItem, body: bytes) -> dict:
+    """
+    A scope for `item` that reuses the batch request's verified token and claims, so
+    the sub-request is authenticated once and skips the middleware stack.
+    """
+    url = urlsplit(item.path)
+    headers = [
+        (name, value) for name, value in request.scope["headers"]
+        if name not in (b"content-length", b"content-type") and name.decode("latin-1") not in SUB_REQUEST_HEADERS
+    ]
+    headers += [
+        (name.lower().encode("latin-1"), value.encode("latin-1"))
+        for name, value in item.headers.items() if name.lower() in SUB_REQUEST_HEADERS
+    ]
+    if body:
+        headers += [(b"content-type", b"application/json"), (b"content-length", str(len(body)).encode())]
+
+    scope = {
+        key: value for key, value in request.scope.items()
+        if key not in ("router", "endpoint", "route", "path_params", "state", "headers")
+    }
+    scope.update({
+        "method": item.method.upper(),
+        "path": url.path,
+        "raw_path": url.path.encode(),
+        "query_string": url.query.encode(),
+        "headers": headers,
+        "state": dict(request.scope.get("state", {})),
+    })
+    return scope
+
+
+async def _dispatch(request: Request, item: BatchItem) -> dict:
+    body = json.dumps(item.body).encode() if item.body is not None else b""
+    scope = _sub_scope(request, item, body)
+    context = RequestContext()
+    set_context(context)
+
+    body_sent = False
+    never = asyncio.Event()
+    response_complete = asyncio.Event()
+    start: Optional[Message] = None
+    chunks = []
+
+    async def receive() -> Message:
+        nonlocal body_sent
+        if not body_sent:
+            body_sent = True
+            return {"type": "http.request", "body": body, "more_body": False}
+        await never.wait()
+        return {"type": "http.disconnect"}
+
+    async def send(message: Message):
+        nonlocal start
+        if message["type"] == "http.response.start":
+            start = message
+        elif message["type"] == "http.response.body":
+            chunks.append(message.get("body", b""))
+            if not message.get("more_body", False):
+                response_complete.set()
+
+    # Sub-requests skip the middleware stack, so keyed POSTs get the idempotency store here.
+    task = asyncio.ensure_future(IdempotencyMiddleware(request.app.router)(scope, receive, send))
+    completion = asyncio.ensure_future(response_complete.wait())
+    try:
+        await asyncio.wait({task, completion}, return_when=asyncio.FIRST_COMPLETED)
+    finally:
+        completion.cancel()
+        if not task.done() and not response_complete.is_set():
+            task.cancel()
+
+    if not task.done():
+        # The response is complete and only the route's background tasks (e.g. event
+        # update notifications) are left; they must not hold up the batch.
+        _detached.add(task)
+        task.add_done_callback(_background_done)
+    elif isinstance(task.exception(), StarletteHTTPException):
+        # Raised by the router itself for unmatched paths and methods (404/405).
+        error = task.exception()
+        return {"id": item.id, "status": error.status_code, "headers": dict(error.headers or {}), "body": {"detail": error.detail}}
+    elif task.exception() is not None:
+        logger.error("Batch sub-request failed", extra={"fields": {
+            "method": item.method, "path": item.path, "error": str(task.exception()),
+        }})
+        return {"id": item.id, "status": 500, "headers": {}, "body": {"detail": "Internal Server Error"}}
+
+    headers = {
+        name.decode("latin-1"): value.decode("latin-1") for name, value in start["headers"]
+        if name != b"content-length"
+    }
+    headers.update((name.lower(), value) for name, value in context.response_headers.items())
+    raw = b"".join(chunks)
+    if not raw:
+        payload = None
+    elif headers.get("content-type", "").startswith("application/json"):
+        payload = json.loads(raw)
+    else:
+        payload = raw.decode("utf-8", errors="replace")
+    return {"id": item.id, "status": start["status"], "headers": headers, "body": payload}
+
+
+@router.post("", response_model=HATEOASResponse)
+async def execute_batch(batch: BatchRequest, request: Request, claims: dict = Depends(get_claims)):
+    """
+    Runs up to BATCH_MAX_ITEMS composite sub-requests, at most BATCH_MAX_CONCURRENCY at
+    a time, under the batch's own authentication and deadline. Identical upstream GETs
+    across the batch are made once. Each item gets its own status, headers and body,
+    in request order.
+    """
+    if not batch.requests:
+        raise HTTPException(status_code=400, detail="Batch must contain at least one request")
+    if len(batch.requests) > config.BATCH_MAX_ITEMS:
+        raise HTTPException(status_code=400, detail=f"Batch is limited to {config.BATCH_MAX_ITEMS} requests")
+    for item in batch.requests:
+        _validate(item)
+
+    semaphore = asyncio.Semaphore(config.BATCH_MAX_CONCURRENCY)
+
+    async def run(item: BatchItem) -> dict:
+        async with semaphore:
+            return await _dispatch(request, item)
+
+    token = set_batch_memo({})
+    try:
+        responses = await asyncio.gather(*(run(item) for item in batch.requests))
+    finally:
+        reset_batch_memo(token)
+    return HATEOASJSONResponse(hateoas_envelope({"responses": responses}, "Batch executed", []))
@@ -1,39 +1,107 @@
-from fastapi import APIRouter, HTTPException, Depends, Query, Response, BackgroundTasks
+from fastapi import APIRouter, HTTPException, Depends, Query, Request, Response, BackgroundTasks
+from fastapi.responses import JSONResponse
+from pydantic import BaseModel
+from typing import List, Optional
 from app.services.composite_service import CompositeService
-from app.models.response import HATEOASResponse, HATEOASLink
-from app.utils.dependencies import get_token, verify_custom_jwt
+from app.services.job_engine import SUCCEEDED
+from app.models.response import (
+    HATEOASJSONResponse,
+    HATEOASLink,
+    HATEOASResponse,
+    HATEOASStreamingResponse,
+    LinkTemplate,
+    hateoas_envelope,
+)
+from app.utils.conditional import check_not_modified
+from app.utils.dependencies import get_claims, get_composite_service, get_token
+from app.utils.pagination import decode_cursor, page_info, page_links
 import httpx
 
 router = APIRouter(prefix="/composite/events", tags=["composite_events"])
 
-async def get_composite_service():
-    service = CompositeService()
-    try:
-        yield service
-    finally:
-        await service.close()
+EVENT_LINKS = LinkTemplate(
+    ("self", "/composite/events/{event_id}", "GET"),
+    ("modify", "/composite/events/{event_id}", "PUT"),
+    ("delete", "/composite/events/{event_id}", "DELETE"),
+    ("tickets", "/composite/events/{event_id}/tickets", "GET"),
+)
+EVENT_LIST_LINKS = LinkTemplate(
+    ("self", "/composite/events?limit={limit}&offset={offset}", "GET"),
+    ("create", "/composite/events", "POST"),
+)
+ORGANISER_EVENTS_LINKS = LinkTemplate(
+    ("self", "/composite/events/organiser/{oid}?limit={limit}&offset={offset}", "GET"),
+)
 
-def validate_token(token: str):
-    try:
-        try:
-            return verify_custom_jwt(token, 'user')
-        except HTTPException:
-            return verify_custom_jwt(token, 'organiser')
-    except HTTPException:
+def validate_token(claims: dict):
+    if claims.get('profile') not in ('user', 'organiser'):
         raise HTTPException(status_code=403, detail="Access denied: Unauthorized role")
+    return claims
+
+class EventBatchRequest(BaseModel):
+    ids: List[str]
+
+
+def _split_ids(ids: List[str]) -> List[str]:
+    return [event_id for value in ids for event_id in value.split(",") if event_id]
+
+
+async def _lookup_events(event_ids: List[str], request: Request, service: CompositeService, token: str):
+    unique_ids = list(dict.fromkeys(event_ids))
+    if not unique_ids:
+        raise HTTPException(status_code=400, detail="At least one event id is required")
+    if len(unique_ids) > service.config.EVENT_BATCH_MAX_IDS:
+        raise HTTPException(status_code=400, detail=f"At most {service.config.EVENT_BATCH_MAX_IDS} event ids per request")
+
+    events, errors = await service.get_events(unique_ids, token)
+    not_modified = check_not_modified(request)
+    if not_modified is not None:
+        return not_modified
+    links = [{"rel": "event", "href": f"/composite/events/{event_id}", "method": "GET"} for event_id in events]
+    return HATEOASJSONResponse(
+        hateoas_envelope({"events": events, "errors": errors}, "Events retrieved successfully", links)
+    )
+
+@router.get(":batch", response_model=HATEOASResponse)
+async def get_composite_events_batch(
+    request: Request,
+    ids: List[str] = Query(..., description="Event ids, comma-separated and/or repeated"),
+    service: CompositeService = Depends(get_composite_service),
+    token: str = Depends(get_token),
+    claims: dict = Depends(get_claims)
+):
+    """
+    Looks up many events at once: ids are deduplicated, cached events are served from
+    the event cache and the rest are fetched concurrently. Returns a map of id to
+    event plus a map of id to error for the lookups that failed.
+    """
+    validate_token(claims)
+    return await _lookup_events(_split_ids(ids), request, service, token)
+
+@router.post(":batch", response_model=HATEOASResponse)
+async def post_composite_events_batch(
+    body: EventBatchRequest,
+    request: Request,
+    service: CompositeService = Depends(get_composite_service),
+    token: str = Depends(get_token),
+    claims: dict = Depends(get_claims)
+):
+    """
+    Same as GET /composite/events:batch, for id lists too long for a query string.
+    """
+    validate_token(claims)
+    return await _lookup_events(body.ids, request, service, token)
 
 @router.get("/{event_id}", response_model=HATEOASResponse)
-async def get_composite_event(event_id: str, service: CompositeService = Depends(get_composite_service), token: str = Depends(get_token)):
-    validate_token(token)
+async def get_composite_event(event_id: str, request: Request, service: CompositeService = Depends(get_composite_service), token: str = Depends(get_token), claims: dict = Depends(get_claims)):
+    validate_token(claims)
     try:
         event = await service.get_event(event_id, token)
-        links = [
-            HATEOASLink(rel="self", href=f"/composite/events/{event_id}", method="GET"),
-            HATEOASLink(rel="modify", href=f"/composite/events/{event_id}", method="PUT"),
-            HATEOASLink(rel="delete", href=f"/composite/events/{event_id}", method="DELETE"),
-            HATEOASLink(rel="tickets", href=f"/composite/events/{event_id}/tickets", method="GET"),
-        ]
-        return HATEOASResponse(data=event, message="Event retrieved successfully", links=links)
+        not_modified = check_not_modified(request)
+        if not_modified is not None:
+            return not_modified
+        links = EVENT_LINKS.render(event_id=event_id)
+        return HATEOASJSONResponse(hateoas_envelope(event, "Event retrieved successfully", links))
     except httpx.HTTPStatusError as exc:
         raise HTTPException(status_code=exc.response.status_code, detail=exc.response.text)
     except Exception as e:
@@ -41,19 +109,37 @@ async def get_composite_event(event_id: str, service: CompositeService = Depends
 
 @router.get("", response_model=HATEOASResponse)
 async def get_all_composite_events(
+    request: Request,
     limit: int = Query(10, ge=1),
-    offset: int = Query(0, ge=0, le=100),
+    offset: int = Query(0, ge=0),
+    cursor: Optional[str] = Query(None, description="Cursor from a next/prev link; replaces limit and offset."),
+    stream: bool = Query(False, description="If true, relays the upstream body without parsing or caching it."),
     service: CompositeService = Depends(get_composite_service),
-    token: str = Depends(get_token)
+    token: str = Depends(get_token),
+    claims: dict = Depends(get_claims)
 ):
-    validate_token(token)
+    validate_token(claims)
+    if cursor is not None:
+        try:
+            offset, limit = decode_cursor(cursor)
+        except ValueError:
+            raise HTTPException(status_code=400, detail="Invalid cursor")
     try:
-        events = await service.get_all_events(limit=limit, offset=offset, token=token)
-        links = [
-            HATEOASLink(rel="self", href=f"/composite/events?limit={limit}&offset={offset}", method="GET"),
-            HATEOASLink(rel="create", href="/composite/events", method="POST"),
-        ]
-        return HATEOASResponse(data=events, message="Events retrieved successfully", links=links)
+        # Both paths return the upstream listing as `data` and page through next/prev links.
+        if stream:
+            # The streamed page is never parsed, so it cannot tell whether it is the last
+            # one: it always offers `next`, and an empty page ends the listing.
+            upstream = await service.stream_all_events(limit, offset, token)
+            links = EVENT_LIST_LINKS.render(limit=limit, offset=offset)
+            links += page_links("/composite/events", page_info(limit, offset, True))
+            return HATEOASStreamingResponse(upstream, "Events retrieved successfully", links)
+        listing, has_next = await service.get_events_page(limit, offset, token)
+        not_modified = check_not_modified(request)
+        if not_modified is not None:
+            return not_modified
+        links = EVENT_LIST_LINKS.render(limit=limit, offset=offset)
+        links += page_links("/composite/events", page_info(limit, offset, has_next))
+        return HATEOASJSONResponse(hateoas_envelope(listing, "Events retrieved successfully", links))
     except httpx.HTTPStatusError as exc:
         raise HTTPException(status_code=exc.response.status_code, detail=exc.response.text)
     except Exception as e:
@@ -62,19 +148,27 @@ async def get_all_composite_events(
 @router.post("", response_model=HATEOASResponse)
 async def create_composite_event(
     event_data: dict,
-    background_tasks: BackgroundTasks,
     service: CompositeService = Depends(get_composite_service),
     token: str = Depends(get_token),
+    claims: dict = Depends(get_claims),
     response: Response = None,
     async_create: bool = Query(False, description="If true, returns 202 Accepted for async pattern.")
 ):
-    validate_token(token)
+    validate_token(claims)
     try:
         if async_create:
-            background_tasks.add_task(process_event_creation, event_data, token, service)
+            job = service.jobs.submit("create_event", claims.get("email"), lambda: service.create_event(event_data, token))
+            if job is None:
+                return JSONResponse(
+                    status_code=503,
+                    content={"detail": "Event creation queue is full, retry later"},
+                    headers={"Retry-After": str(service.config.JOB_RETRY_AFTER)},
+                )
             response.status_code = 202
-            response.headers["Location"] = f"/composite/events/status/{event_data.get('EID', 'pending')}"
-            return HATEOASResponse(data={}, message="Event creation accepted, processing asynchronously", links=[])
+            response.headers["Location"] = f"/composite/events/status/{job.id}"
+            response.headers["Retry-After"] = "1"
+            links = [HATEOASLink(rel="status", href=f"/composite/events/status/{job.id}", method="GET")]
+            return HATEOASResponse(data=job.to_dict(), message="Event creation accepted, processing asynchronously", links=links)
         else:
             result = await service.create_event(event_data, token)
             event_id = result.get("EID")
@@ -92,20 +186,32 @@ async def create_composite_event(
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
-async def process_event_creation(event_data: dict, token: str, service: CompositeService):
-    try:
-        result = await service.create_event(event_data, token)
-        print("Event created in background:", result)
-    except Exception as e:
-        print(f"Error during event creation in background: {e}")
+@router.get("/status/{job_id}", response_model=HATEOASResponse)
+async def get_event_creation_status(
+    job_id: str,
+    service: CompositeService = Depends(get_composite_service),
+    claims: dict = Depends(get_claims)
+):
+    validate_token(claims)
+    job = service.jobs.get(job_id)
+    # Jobs of other users are reported as missing rather than forbidden.
+    if job is None or job.owner != claims.get("email"):
+        raise HTTPException(status_code=404, detail="Job not found or expired")
+
+    links = [HATEOASLink(rel="self", href=f"/composite/events/status/{job_id}", method="GET")]
+    if job.status == SUCCEEDED and isinstance(job.result, dict) and job.result.get("EID"):
+        links.append(HATEOASLink(rel="event", href=f"/composite/events/{job.result['EID']}", method="GET"))
+    return HATEOASResponse(data=job.to_dict(), message=f"Event creation {job.status}", links=links)
 
 @router.put("", response_model=HATEOASResponse)
 async def update_composite_event(
     event_data: dict, 
+    background_tasks: BackgroundTasks,
     service: CompositeService = Depends(get_composite_service),
-    token: str = Depends(get_token)
+    token: str = Depends(get_token),
+    claims: dict = Depends(get_claims)
 ):
-    validate_token(token)
+    validate_token(claims)
     try:
         result = await service.update_event(event_data, token)
         event_id = result.get("EID")
@@ -114,15 +220,7 @@ async def update_composite_event(
             HATEOASLink(rel="delete", href=f"/composite/events/{event_id}", method="DELETE"),
             HATEOASLink(rel="tickets", href=f"/composite/events/{event_id}/tickets", method="GET"),
         ]
-        user_ids = await service.get_users_by_event(event_id, 100, 0, token)
-        user_emails = []
-        for attendee in user_ids['uids']:
-            profile = await service.get_user(attendee['UID'], token)
-            user_emails.append(profile['details']['Email'])
-
-        if len(user_emails) > 0:
-            event_data['UserEmails'] = list(set(user_emails))
-            await service.publish_event_update_notification(event_data)
+        background_tasks.add_task(service.notify_event_update, event_id, event_data, token)
         return HATEOASResponse(data=result, message="Event updated successfully", links=links)
     except httpx.HTTPStatusError as exc:
         raise HTTPException(status_code=exc.response.status_code, detail=exc.response.text)
@@ -133,9 +231,10 @@ async def update_composite_event(
 async def delete_composite_event(
     event_id: str, 
     service: CompositeService = Depends(get_composite_service),
-    token: str = Depends(get_token)
+    token: str = Depends(get_token),
+    claims: dict = Depends(get_claims)
 ):
-    validate_token(token)
+    validate_token(claims)
     try:
         await service.delete_event(event_id, token)
         links = [
@@ -153,16 +252,19 @@ async def get_events_by_organizer(
     oid: str,
     limit: int = Query(10, ge=1, le=100, description="Number of items per page"),
     offset: int = Query(0, ge=0, description="Offset for pagination"),
+    stream: bool = Query(False, description="If true, relays the upstream body without parsing it."),
     service: CompositeService = Depends(get_composite_service),
-    token: str = Depends(get_token)
+    token: str = Depends(get_token),
+    claims: dict = Depends(get_claims)
 ):
-    validate_token(token)
+    validate_token(claims)
     try:
+        links = ORGANISER_EVENTS_LINKS.render(oid=oid, limit=limit, offset=offset)
+        if stream:
+            upstream = await service.stream_events_by_organizer(oid, limit, offset, token)
+            return HATEOASStreamingResponse(upstream, "Events retrieved successfully", links)
         events = await service.get_events_by_organizer(oid, limit=limit, offset=offset, token=token)
-        links = [
-            HATEOASLink(rel="self", href=f"/composite/events/organiser/{oid}?limit={limit}&offset={offset}", method="GET"),
-        ]
-        return HATEOASResponse(data=events, message="Events retrieved successfully", links=links)
+        return HATEOASJSONResponse(hateoas_envelope(events, "Events retrieved successfully", links))
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to fetch events: {str(e)}")
 
@@ -172,9 +274,10 @@ async def update_guests_remaining(
     eid: str,
     guests_remaining: int,
     service: CompositeService = Depends(get_composite_service),
-    token: str = Depends(get_token)
+    token: str = Depends(get_token),
+    claims: dict = Depends(get_claims)
 ):
-    validate_token(token)
+    validate_token(claims)
     try:
         success = await service.update_guests_remaining(eid, guests_remaining, token)
         if not success:
@@ -0,0 +1,44 @@
+from fastapi import APIRouter, Depends
+from fastapi.responses import PlainTextResponse
+
+from app.middleware.idempotency import idempotency_store
+from app.middleware.logging import queue_handler
+from app.services.composite_service import CompositeService
+from app.utils.dependencies import get_composite_service
+from app.utils.metrics import metrics, render_gauges
+
+router = APIRouter(prefix="/composite/metrics", tags=["composite_metrics"])
+
+PROMETHEUS_CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+@router.get("", response_class=PlainTextResponse)
+async def composite_metrics(service: CompositeService = Depends(get_composite_service)):
+    """
+    Exposes upstream latency, status and in-flight metrics, plus cache, notification
+    outbox, job engine, idempotency and log pipeline counters, in the Prometheus text format.
+    """
+    body = "".join([
+        metrics.render(),
+        render_gauges("composite_event_cache", "Event read cache statistics.", "stat", service.event_cache.stats()),
+        render_gauges("composite_notification_outbox", "Notification outbox statistics.", "stat", service.outbox.stats()),
+        render_gauges("composite_jobs", "Async job engine statistics.", "stat", service.jobs.stats()),
+        render_gauges("composite_idempotency", "Idempotency-Key store statistics.", "stat", idempotency_store.stats()),
+        render_gauges(
+            "composite_circuit_breaker_open", "1 when the upstream's circuit breaker is not closed.", "upstream",
+            {upstream: int(breaker.state != "closed") for upstream, breaker in service.breakers.items()},
+        ),
+        render_gauges(
+            "composite_bulkhead_in_use", "Concurrent upstream calls holding a bulkhead slot.", "upstream",
+            {upstream: bulkhead.in_use for upstream, bulkhead in service.bulkheads.items()},
+        ),
+        render_gauges(
+            "composite_background_bulkhead_in_use", "Background upstream calls holding a bulkhead slot.", "upstream",
+            {upstream: bulkhead.in_use for upstream, bulkhead in service.background_bulkheads.items()},
+        ),
+        render_gauges(
+            "composite_stream_bulkhead_in_use", "Streamed upstream reads holding a bulkhead slot.", "upstream",
+            {upstream: bulkhead.in_use for upstream, bulkhead in service.stream_bulkheads.items()},
+        ),
+        render_gauges("composite_log_pipeline", "Request log pipeline statistics.", "stat", {"dropped": queue_handler.dropped}),
+    ])
+    return PlainTextResponse(body, media_type=PROMETHEUS_CONTENT_TYPE)
@@ -2,25 +2,19 @@ import httpx
 from fastapi import APIRouter, HTTPException, Depends
 from app.services.composite_service import CompositeService
 from app.models.response import HATEOASResponse, HATEOASLink
-from app.utils.dependencies import get_token, verify_custom_jwt
+from app.utils.dependencies import get_claims, get_composite_service, get_token, require_profile
 
 router = APIRouter(prefix="/composite/organiser", tags=["composite_organiser"])
 
-async def get_composite_service():
-    service = CompositeService()
-    try:
-        yield service
-    finally:
-        await service.close()
-
 @router.get("/{organiser_id}", response_model=HATEOASResponse)
 async def get_organiser(
     organiser_id: str,
     service: CompositeService = Depends(get_composite_service),
-    token: str = Depends(get_token)
+    token: str = Depends(get_token),
+    claims: dict = Depends(get_claims)
 ):
     
-    verify_custom_jwt(token, "user")  # Validate JWT with 'organiser' role
+    require_profile(claims, "user")  # Validate JWT with 'organiser' role
     try:
         organiser = await service.get_organiser(organiser_id, token)
         links = [
@@ -42,10 +36,11 @@ async def get_organiser(
 async def create_organiser(
     organiser_data: dict,
     service: CompositeService = Depends(get_composite_service),
-    token: str = Depends(get_token)
+    token: str = Depends(get_token),
+    claims: dict = Depends(get_claims)
 ):
 
-    verify_custom_jwt(token, "organiser")  # Validate JWT with 'organiser' role
+    require_profile(claims, "organiser")  # Validate JWT with 'organiser' role
     try:
         organiser = await service.create_organiser(organiser_data, token)
         organiser_id = organiser.get("organiser_id")
@@ -69,10 +64,11 @@ async def update_organiser(
     organiser_id: str,
     organiser_data: dict,
     service: CompositeService = Depends(get_composite_service),
-    token: str = Depends(get_token)
+    token: str = Depends(get_token),
+    claims: dict = Depends(get_claims)
 ):
   
-    verify_custom_jwt(token, "organiser")  # Validate JWT with 'organiser' role
+    require_profile(claims, "organiser")  # Validate JWT with 'organiser' role
     try:
         organiser = await service.update_organiser(organiser_id, organiser_data, token)
         links = [
@@ -93,10 +89,11 @@ async def update_organiser(
 async def delete_organiser(
     organiser_id: str,
     service: CompositeService = Depends(get_composite_service),
-    token: str = Depends(get_token)
+    token: str = Depends(get_token),
+    claims: dict = Depends(get_claims)
 ):
 
-    verify_custom_jwt(token, "organiser")  # Validate JWT with 'organiser' role
+    require_profile(claims, "organiser")  # Validate JWT with 'organiser' role
     try:
         await service.delete_organiser(organiser_id, token)
         links = [
@@ -113,8 +110,8 @@ async def delete_organiser(
 
 
 @router.get("/", response_model=HATEOASResponse)
-async def get_organiser(service: CompositeService = Depends(get_composite_service), token: str = Depends(get_token)):
-    organiser_info = verify_custom_jwt(token, 'organiser')
+async def get_organiser(service: CompositeService = Depends(get_composite_service), token: str = Depends(get_token), claims: dict = Depends(get_claims)):
+    organiser_info = require_profile(claims, 'organiser')
     email = organiser_info.get('email')
     if not email:
         raise HTTPException(status_code=400, detail="Email not found in token")
@@ -1,32 +1,49 @@
-import httpx
-from fastapi import APIRouter, HTTPException, Depends, Query
+from typing import Optional
 
-from app.models.response import HATEOASResponse, HATEOASLink
+import httpx
+from fastapi import APIRouter, HTTPException, Depends, Query, Request
+
+from app.models.response import (
+    HATEOASJSONResponse,
+    HATEOASLink,
+    HATEOASResponse,
+    HATEOASStreamingResponse,
+    LinkTemplate,
+    hateoas_envelope,
+)
 from app.services.composite_service import CompositeService
-from app.utils.dependencies import get_token, verify_custom_jwt
+from app.utils.conditional import check_not_modified
+from app.utils.dependencies import get_claims, get_composite_service, get_token
+from app.utils.pagination import decode_cursor, page_links
 
 router = APIRouter(prefix="/composite/ticket", tags=["composite_ticket"])
 
-async def get_composite_service():
-    service = CompositeService()
-    try:
-        yield service
-    finally:
-        await service.close()
-
-def validate_token(token: str):
-    try:
-        try:
-            return verify_custom_jwt(token, 'user')
-        except HTTPException:
-            return verify_custom_jwt(token, 'organiser')
-    except HTTPException:
+TICKETS_AND_EVENTS_LINKS = LinkTemplate(
+    ("self", "/composite/ticket/user/{user_id}/all?limit={limit}&offset={offset}", "GET"),
+    ("tickets_only", "/composite/ticket/user/{user_id}", "GET"),
+)
+ENRICHED_TICKETS_LINKS = LinkTemplate(
+    ("self", "/composite/ticket/user/{user_id}/enriched", "GET"),
+    ("tickets_only", "/composite/ticket/user/{user_id}", "GET"),
+)
+BOOKING_LINKS = LinkTemplate(
+    ("self", "/composite/event-booking/{booking_id}", "GET"),
+    ("cancel", "/composite/event-booking/{booking_id}", "DELETE"),
+    ("book_new", "/composite/event-booking", "POST"),
+)
+EVENT_USERS_LINKS = LinkTemplate(
+    ("self", "/composite/tickets/event/{eid}/users?limit={limit}&offset={offset}", "GET"),
+)
+
+def validate_token(claims: dict):
+    if claims.get('profile') not in ('user', 'organiser'):
         raise HTTPException(status_code=403, detail="Access denied: Unauthorized role")
+    return claims
 
 
 @router.post("/", response_model=HATEOASResponse)
-async def book_ticket(booking_data: dict, service: CompositeService = Depends(get_composite_service), token: str = Depends(get_token)):
-    validate_token(token)
+async def book_ticket(booking_data: dict, service: CompositeService = Depends(get_composite_service), token: str = Depends(get_token), claims: dict = Depends(get_claims)):
+    validate_token(claims)
     try:
         result = await service.book_ticket(booking_data, token)
         booking_id = result.get("TID")
@@ -50,9 +67,19 @@ async def book_ticket(booking_data: dict, service: CompositeService = Depends(ge
 
 
 @router.get("/{booking_id}", response_model=HATEOASResponse)
-async def fetch_ticket(booking_id: str, service: CompositeService = Depends(get_composite_service), token: str = Depends(get_token)):
-    validate_token(token)
+async def fetch_ticket(
+    booking_id: str,
+    stream: bool = Query(False, description="If true, relays the upstream body without parsing it."),
+    service: CompositeService = Depends(get_composite_service),
+    token: str = Depends(get_token),
+    claims: dict = Depends(get_claims)
+):
+    validate_token(claims)
     try:
+        if stream:
+            upstream = await service.stream_ticket(booking_id, token)
+            links = BOOKING_LINKS.render(booking_id=booking_id)
+            return HATEOASStreamingResponse(upstream, "Event booking details retrieved successfully", links)
         booking = await service.fetch_ticket(booking_id, token)
         links = [
             HATEOASLink(rel="self", href=f"/composite/event-booking/{booking_id}", method="GET"),
@@ -66,8 +93,8 @@ async def fetch_ticket(booking_id: str, service: CompositeService = Depends(get_
         raise HTTPException(status_code=500, detail=str(e))
 
 @router.delete("/{booking_id}", response_model=HATEOASResponse)
-async def cancel_ticket(booking_id: str, service: CompositeService = Depends(get_composite_service), token: str = Depends(get_token)):
-    validate_token(token)
+async def cancel_ticket(booking_id: str, service: CompositeService = Depends(get_composite_service), token: str = Depends(get_token), claims: dict = Depends(get_claims)):
+    validate_token(claims)
     try:
         result = await service.cancel_ticket(booking_id, token)
         links = [
@@ -81,8 +108,8 @@ async def cancel_ticket(booking_id: str, service: CompositeService = Depends(get
         raise HTTPException(status_code=500, detail=str(e))
 
 @router.get("/user/{user_id}", response_model=HATEOASResponse)
-async def get_tickets_of_user(user_id: str, service: CompositeService = Depends(get_composite_service), token: str = Depends(get_token)):
-    validate_token(token)
+async def get_tickets_of_user(user_id: str, service: CompositeService = Depends(get_composite_service), token: str = Depends(get_token), claims: dict = Depends(get_claims)):
+    validate_token(claims)
     try:
         tickets = await service.get_tickets_by_user(user_id, token)
         links = [
@@ -100,48 +127,32 @@ async def get_tickets_of_user(user_id: str, service: CompositeService = Depends(
 @router.get("/user/{user_id}/all", response_model=HATEOASResponse)
 async def get_tickets_and_events_of_user(
     user_id: str,
-    limit: int = 10,
-    offset: int = 0,
+    request: Request,
+    limit: int = Query(10, ge=1),
+    offset: int = Query(0, ge=0),
+    cursor: Optional[str] = Query(None, description="Cursor from a next/prev link; replaces limit and offset."),
     service: CompositeService = Depends(get_composite_service),
-    token: str = Depends(get_token)
+    token: str = Depends(get_token),
+    claims: dict = Depends(get_claims)
 ):
-    validate_token(token)
+    validate_token(claims)
+    if cursor is not None:
+        try:
+            offset, limit = decode_cursor(cursor)
+        except ValueError:
+            raise HTTPException(status_code=400, detail="Invalid cursor")
     try:
         combined_data = await service.get_tickets_and_events(user_id, limit=limit, offset=offset, token=token)
+        not_modified = check_not_modified(request)
+        if not_modified is not None:
+            return not_modified
 
-        current_limit = combined_data["events_pagination"]["limit"]
-        current_offset = combined_data["events_pagination"]["offset"]
-        has_next = combined_data["events_pagination"]["has_next"]
-        has_prev = combined_data["events_pagination"]["has_prev"]
-
-        links = [
-            HATEOASLink(rel="self", href=f"/composite/ticket/user/{user_id}/all?limit={current_limit}&offset={current_offset}", method="GET"),
-            HATEOASLink(rel="tickets_only", href=f"/composite/ticket/user/{user_id}", method="GET"),
-        ]
+        pagination = combined_data["events_pagination"]
+        links = TICKETS_AND_EVENTS_LINKS.render(user_id=user_id, limit=pagination["limit"], offset=pagination["offset"])
+        links += page_links(f"/composite/ticket/user/{user_id}/all", pagination)
 
-        if has_next:
-            next_offset = current_offset + current_limit
-            links.append(
-                HATEOASLink(
-                    rel="next",
-                    href=f"/composite/ticket/user/{user_id}/all?limit={current_limit}&offset={next_offset}",
-                    method="GET"
-                )
-            )
-        if has_prev:
-            prev_offset = max(current_offset - current_limit, 0)
-            links.append(
-                HATEOASLink(
-                    rel="prev",
-                    href=f"/composite/ticket/user/{user_id}/all?limit={current_limit}&offset={prev_offset}",
-                    method="GET"
-                )
-            )
-
-        return HATEOASResponse(
-            data=combined_data,
-            message="Tickets and events retrieved successfully",
-            links=links
+        return HATEOASJSONResponse(
+            hateoas_envelope(combined_data, "Tickets and events retrieved successfully", links)
         )
     except httpx.HTTPStatusError as exc:
         if exc.response.status_code == 404:
@@ -151,20 +162,47 @@ async def get_tickets_and_events_of_user(
         raise HTTPException(status_code=500, detail=str(e))
 
 
+@router.get("/user/{user_id}/enriched", response_model=HATEOASResponse)
+async def get_enriched_tickets_of_user(
+    user_id: str,
+    request: Request,
+    service: CompositeService = Depends(get_composite_service),
+    token: str = Depends(get_token),
+    claims: dict = Depends(get_claims)
+):
+    validate_token(claims)
+    try:
+        enriched = await service.get_enriched_tickets(user_id, token)
+        not_modified = check_not_modified(request)
+        if not_modified is not None:
+            return not_modified
+        links = ENRICHED_TICKETS_LINKS.render(user_id=user_id)
+        return HATEOASJSONResponse(hateoas_envelope(enriched, "Tickets with events retrieved successfully", links))
+    except httpx.HTTPStatusError as exc:
+        if exc.response.status_code == 404:
+            raise HTTPException(status_code=404, detail="User or tickets not found")
+        raise HTTPException(status_code=exc.response.status_code, detail=exc.response.text)
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+
 @router.get("/event/{eid}/users", response_model=HATEOASResponse)
 async def get_users_by_event(
     eid: str,
     limit: int = Query(10, ge=1, le=100, description="Number of users per page"),
     offset: int = Query(0, ge=0, description="Offset for pagination"),
+    stream: bool = Query(False, description="If true, relays the upstream body without parsing it."),
     service: CompositeService = Depends(get_composite_service),
-    token: str = Depends(get_token)
+    token: str = Depends(get_token),
+    claims: dict = Depends(get_claims)
 ):
-    validate_token(token)
+    validate_token(claims)
     try:
+        links = EVENT_USERS_LINKS.render(eid=eid, limit=limit, offset=offset)
+        if stream:
+            upstream = await service.stream_users_by_event(eid, limit, offset, token)
+            return HATEOASStreamingResponse(upstream, "Users retrieved successfully", links)
         users = await service.get_users_by_event(eid, limit=limit, offset=offset, token=token)
-        links = [
-            HATEOASLink(rel="self", href=f"/composite/tickets/event/{eid}/users?limit={limit}&offset={offset}", method="GET"),
-        ]
-        return HATEOASResponse(data=users, message="Users retrieved successfully", links=links)
+        return HATEOASJSONResponse(hateoas_envelope(users, "Users retrieved successfully", links))
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to fetch users: {str(e)}")
\ No newline at end of file
@@ -3,20 +3,13 @@ from fastapi import APIRouter, HTTPException, Depends
 
 from app.models.response import HATEOASResponse, HATEOASLink
 from app.services.composite_service import CompositeService
-from app.utils.dependencies import get_token, verify_custom_jwt
+from app.utils.dependencies import get_claims, get_composite_service, get_token, require_profile
 
 router = APIRouter(prefix="/composite/user", tags=["composite_user"])
 
-async def get_composite_service():
-    service = CompositeService()
-    try:
-        yield service
-    finally:
-        await service.close()
-
 @router.post("/", response_model=HATEOASResponse, status_code=201)
-async def create_user(user_data: dict, service: CompositeService = Depends(get_composite_service), token: str = Depends(get_token)):
-    verify_custom_jwt(token, 'user')
+async def create_user(user_data: dict, service: CompositeService = Depends(get_composite_service), token: str = Depends(get_token), claims: dict = Depends(get_claims)):
+    require_profile(claims, 'user')
     try:
         result = await service.create_user(user_data, token)
         user_id = result.get("UID")
@@ -32,8 +25,8 @@ async def create_user(user_data: dict, service: CompositeService = Depends(get_c
         raise HTTPException(status_code=500, detail="Internal Server Error")
 
 @router.get("/{user_id}", response_model=HATEOASResponse)
-async def get_user(user_id: str, service: CompositeService = Depends(get_composite_service), token: str = Depends(get_token)):
-    verify_custom_jwt(token, 'organiser')
+async def get_user(user_id: str, service: CompositeService = Depends(get_composite_service), token: str = Depends(get_token), claims: dict = Depends(get_claims)):
+    require_profile(claims, 'organiser')
     try:
         user = await service.get_user(user_id, token)
         links = [
@@ -50,8 +43,8 @@ async def get_user(user_id: str, service: CompositeService = Depends(get_composi
         raise HTTPException(status_code=500, detail="Internal Server Error")
 
 @router.put("/", response_model=HATEOASResponse)
-async def modify_user(user_data: dict, service: CompositeService = Depends(get_composite_service), token: str = Depends(get_token)):
-    verify_custom_jwt(token, 'user')
+async def modify_user(user_data: dict, service: CompositeService = Depends(get_composite_service), token: str = Depends(get_token), claims: dict = Depends(get_claims)):
+    require_profile(claims, 'user')
     try:
         result = await service.modify_user(user_data['UID'], user_data, token)
         user_id = result.get("UID")
@@ -68,8 +61,8 @@ async def modify_user(user_data: dict, service: CompositeService = Depends(get_c
         raise HTTPException(status_code=500, detail="Internal Server Error")
 
 @router.delete("/{user_id}", response_model=HATEOASResponse)
-async def delete_user(user_id: str, service: CompositeService = Depends(get_composite_service), token: str = Depends(get_token)):
-    verify_custom_jwt(token, 'user')
+async def delete_user(user_id: str, service: CompositeService = Depends(get_composite_service), token: str = Depends(get_token), claims: dict = Depends(get_claims)):
+    require_profile(claims, 'user')
     try:
         result = await service.delete_user(user_id, token)
         links = [
@@ -84,8 +77,8 @@ async def delete_user(user_id: str, service: CompositeService = Depends(get_comp
         raise HTTPException(status_code=500, detail="Internal Server Error")
 
 @router.get("/", response_model=HATEOASResponse)
-async def get_user(service: CompositeService = Depends(get_composite_service), token: str = Depends(get_token)):
-    user_info = verify_custom_jwt(token, 'user')
+async def get_user(service: CompositeService = Depends(get_composite_service), token: str = Depends(get_token), claims: dict = Depends(get_claims)):
+    user_info = require_profile(claims, 'user')
     email = user_info.get('email')
     if not email:
         raise HTTPException(status_code=400, detail="Email not found in token")
@@ -0,0 +1,49 @@
+import random
+import threading
+import time
+import uuid
+
+
+class StubAWSError(Exception):
+    pass
+
+
+class _StubClient:
+    """
+    Offline stand-in for a boto3 client. Records every call and can simulate
+    latency and a failure rate, so the notification outbox can run without AWS.
+    """
+    def __init__(self, latency: float = 0.0, failure_rate: float = 0.0):
+        self.latency = latency
+        self.failure_rate = failure_rate
+        self.calls = []
+        self._lock = threading.Lock()
+
+    def _call(self, operation: str, **kwargs):
+        if self.latency:
+            time.sleep(self.latency)
+        if self.failure_rate and random.random() < self.failure_rate:
+            raise StubAWSError(f"Simulated {operation} failure")
+        with self._lock:
+            self.calls.append((operation, kwargs))
+
+
+class StubLambdaClient(_StubClient):
+    def invoke(self, FunctionName: str, InvocationType: str = "RequestResponse", Payload: bytes = b""):
+        self._call("invoke", FunctionName=FunctionName, InvocationType=InvocationType, Payload=Payload)
+        return {"StatusCode": 202}
+
+
+class StubSNSClient(_StubClient):
+    def publish(self, TopicArn: str, Message: str, Subject: str = None):
+        self._call("publish", TopicArn=TopicArn, Message=Message, Subject=Subject)
+        return {"MessageId": str(uuid.uuid4())}
+
+    def publish_batch(self, TopicArn: str, PublishBatchRequestEntries: list):
+        self._call("publish_batch", TopicArn=TopicArn, PublishBatchRequestEntries=PublishBatchRequestEntries)
+        return {
+            "Successful": [
+                {"Id": entry["Id"], "MessageId": str(uuid.uuid4())} for entry in PublishBatchRequestEntries
+            ],
+            "Failed": [],
+        }
@@ -1,230 +1,892 @@
+import hashlib
 import json
 import os
-from typing import List
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, List, Optional, Tuple
 
 import httpx
+from jwt import InvalidTokenError
 from app.utils.config import Config
 import asyncio
+import time
 import boto3
 
+from app.middleware.logging import logger
+from app.services.aws_stub import StubLambdaClient, StubSNSClient
+from app.services.job_engine import JobEngine
+from app.services.notification_outbox import NotificationOutbox
+from app.utils.auth import token_verifier
+from app.utils.cache import TTLCache
+from app.utils.hedging import HedgeBudget, LatencyTracker
+from app.utils.metrics import metrics
+from app.utils.pagination import page_info
+from app.utils.request_context import (
+    DEADLINE_HEADER,
+    current_batch_memo,
+    current_context,
+    current_deadline,
+    detach_deadline,
+    is_background,
+    mark_background,
+    remaining_budget,
+    set_context,
+)
+from app.utils.resilience import Bulkhead, CircuitBreaker, UpstreamTimeoutError, UpstreamUnavailableError
+from app.utils.singleflight import SingleFlight
+
 config = Config()
 
+UPSTREAMS = ("user", "event", "ticket")
+#User and Ticket reads that are event-scoped rather than per-user, so callers with the same
+#profile may share one in-flight call.
+ROLE_SHARED_OPERATIONS = ("get_users_by_event",)
+HEALTH_CHECK_NAMES = {"user": "user_management", "event": "event_management", "ticket": "event_booking"}
+
+UPSTREAM_LATENCY = metrics.histogram(
+    "composite_upstream_request_duration_seconds",
+    "Latency of calls to the User, Event and Ticket services.",
+    ("upstream", "operation"),
+)
+UPSTREAM_RESPONSES = metrics.counter(
+    "composite_upstream_responses_total",
+    "Upstream calls by response status ('error' when no response was received).",
+    ("upstream", "operation", "status"),
+)
+UPSTREAM_REJECTIONS = metrics.counter(
+    "composite_upstream_rejections_total",
+    "Upstream calls failed fast by an open circuit breaker or a full bulkhead.",
+    ("upstream", "reason"),
+)
+HEDGES_SENT = metrics.counter(
+    "composite_upstream_hedges_total",
+    "Second attempts sent for slow idempotent upstream GETs.",
+    ("upstream", "operation"),
+)
+HEDGE_WINS = metrics.counter(
+    "composite_upstream_hedge_wins_total",
+    "Hedged GETs where the second attempt answered first.",
+    ("upstream", "operation"),
+)
+UPSTREAM_IN_FLIGHT = metrics.gauge(
+    "composite_upstream_in_flight_requests",
+    "Upstream calls currently waiting for a response.",
+    ("upstream", "operation"),
+)
+
+class _ReleasingStream(httpx.AsyncByteStream):
+    """
+    Wraps a streamed upstream body and calls `release` once when it is closed.
+    """
+
+    def __init__(self, stream: httpx.AsyncByteStream, release: Callable[[], None]):
+        self._stream = stream
+        self._release = release
+
+    async def __aiter__(self) -> AsyncIterator[bytes]:
+        async for chunk in self._stream:
+            yield chunk
+
+    async def aclose(self):
+        try:
+            await self._stream.aclose()
+        finally:
+            if self._release is not None:
+                release, self._release = self._release, None
+                release()
+
+
 class CompositeService:
-    def __init__(self):
-        self.client = httpx.AsyncClient()
+    def __init__(self, transports: Optional[Dict[str, httpx.AsyncBaseTransport]] = None):
+        """
+        `transports` optionally maps "user", "event" and "ticket" to custom httpx
+        transports, e.g. in-process stub services for load tests.
+        """
         self.config = Config()
+        transports = transports or {}
+
+        self.user_client = self._build_client(transports.get("user"))
+        self.event_client = self._build_client(transports.get("event"))
+        self.ticket_client = self._build_client(transports.get("ticket"))
 
-        self.lambda_client = boto3.client('lambda', region_name=os.getenv('AWS_REGION', 'us-east-1'))
+        self.breakers = {upstream: self._build_breaker(upstream) for upstream in UPSTREAMS}
+        self.bulkheads = {
+            upstream: Bulkhead(self.config.BULKHEAD_MAX_CONCURRENCY, self.config.BULKHEAD_MAX_WAIT)
+            for upstream in UPSTREAMS
+        }
+        self.background_bulkheads = {
+            upstream: Bulkhead(self.config.BACKGROUND_BULKHEAD_MAX_CONCURRENCY, self.config.BACKGROUND_BULKHEAD_MAX_WAIT)
+            for upstream in UPSTREAMS
+        }
+        self.stream_bulkheads = {
+            upstream: Bulkhead(self.config.STREAM_BULKHEAD_MAX_CONCURRENCY, self.config.BULKHEAD_MAX_WAIT)
+            for upstream in UPSTREAMS
+        }
+        self.singleflight = SingleFlight()
+        self.hedge_budget = HedgeBudget(self.config.HEDGE_BUDGET_PERCENT)
+        self._latency_trackers: Dict[tuple, LatencyTracker] = {}
+        self._health_report: Optional[Dict[str, dict]] = None
+        self._health_checked_at = 0.0
+        self.event_cache = TTLCache(
+            self.config.EVENT_CACHE_SIZE,
+            self.config.EVENT_CACHE_TTL,
+            stale_ttl=max(self.config.EVENT_CACHE_STALE_WHILE_REVALIDATE, self.config.EVENT_CACHE_STALE_IF_ERROR),
+        )
+        self._revalidations: Dict[tuple, asyncio.Future] = {}
+
+        if self.config.AWS_STUB_CLIENTS:
+            self.lambda_client = StubLambdaClient()
+            self.sns_client = StubSNSClient()
+        else:
+            self.lambda_client = boto3.client('lambda', region_name=os.getenv('AWS_REGION', 'us-east-1'))
+            self.sns_client = boto3.client('sns', region_name=os.getenv('AWS_REGION', 'us-east-1'))
         self.lambda_function_name = os.getenv('SEND_EMAIL_LAMBDA_FUNCTION_NAME')
-        self.sns_client = boto3.client('sns', region_name=os.getenv('AWS_REGION', 'us-east-1'))
         self.sns_topic_arn = os.getenv('EVENT_UPDATED_SNS_TOPIC_ARN')
+        self.outbox = NotificationOutbox(self.lambda_client, self.sns_client, self.config)
+        self.jobs = JobEngine(self.config)
+
+    def _build_client(self, transport: Optional[httpx.AsyncBaseTransport] = None) -> httpx.AsyncClient:
+        limits = httpx.Limits(
+            max_connections=self.config.UPSTREAM_MAX_CONNECTIONS,
+            max_keepalive_connections=self.config.UPSTREAM_MAX_KEEPALIVE_CONNECTIONS,
+            keepalive_expiry=self.config.UPSTREAM_KEEPALIVE_EXPIRY,
+        )
+        timeout = httpx.Timeout(
+            connect=self.config.UPSTREAM_CONNECT_TIMEOUT,
+            read=self.config.UPSTREAM_READ_TIMEOUT,
+            write=self.config.UPSTREAM_WRITE_TIMEOUT,
+            pool=self.config.UPSTREAM_POOL_TIMEOUT,
+        )
+        return httpx.AsyncClient(limits=limits, timeout=timeout, transport=transport)
+
+    def _build_breaker(self, upstream: str) -> CircuitBreaker:
+        return CircuitBreaker(
+            upstream,
+            window_size=self.config.CIRCUIT_BREAKER_WINDOW,
+            minimum_calls=self.config.CIRCUIT_BREAKER_MIN_CALLS,
+            failure_rate_threshold=self.config.CIRCUIT_BREAKER_FAILURE_RATE,
+            slow_call_duration=self.config.CIRCUIT_BREAKER_SLOW_CALL_SECONDS,
+            slow_call_rate_threshold=self.config.CIRCUIT_BREAKER_SLOW_CALL_RATE,
+            open_duration=self.config.CIRCUIT_BREAKER_OPEN_SECONDS,
+            half_open_calls=self.config.CIRCUIT_BREAKER_HALF_OPEN_CALLS,
+        )
+
+    async def start(self):
+        """
+        Starts the job engine and notification outbox workers. Called once on application startup.
+        """
+        self.jobs.start()
+        self.outbox.start()
 
     async def close(self):
-        await self.client.aclose()
+        """
+        Finishes queued jobs, delivers queued notifications and drains the upstream
+        connection pools. Called once on application shutdown.
+        """
+        await self.jobs.stop()
+        await self.outbox.stop()
+        for task in list(self._revalidations.values()):
+            task.cancel()
+        await asyncio.gather(
+            self.user_client.aclose(),
+            self.event_client.aclose(),
+            self.ticket_client.aclose(),
+        )
 
     def _get_headers(self, token: str):
         return {"Authorization": f"Bearer {token}"} if token else {}
 
+    async def _request(self, upstream: str, operation: str, method: str, url: str, token: str,
+                       stream: bool = False, **kwargs) -> httpx.Response:
+        """
+        Sends one request to `upstream` ("user", "event" or "ticket") through its bulkhead
+        and circuit breaker, and records its latency, status and in-flight count under
+        the given operation name. Raises UpstreamUnavailableError without calling the
+        upstream when the breaker is open or the bulkhead is full.
+
+        When the request has a deadline, the remaining budget bounds the call and is
+        forwarded downstream in the X-Request-Timeout header (milliseconds).
+
+        With `stream`, the body is left unread and a slot of the stream bulkhead is held
+        until the response is closed. Calls from background work (see mark_background)
+        use the background bulkheads.
+        """
+        remaining = remaining_budget()
+        if remaining is not None and remaining <= 0:
+            raise UpstreamTimeoutError(upstream, "request deadline exceeded", method, url)
+
+        breaker = self.breakers[upstream]
+        if stream:
+            bulkhead = self.stream_bulkheads[upstream]
+        elif is_background():
+            bulkhead = self.background_bulkheads[upstream]
+        else:
+            bulkhead = self.bulkheads[upstream]
+        if not await bulkhead.acquire():
+            UPSTREAM_REJECTIONS.inc(upstream=upstream, reason="bulkhead_full")
+            raise UpstreamUnavailableError(upstream, "too many concurrent requests", method, url)
+        release = True
+        try:
+            if not breaker.allow():
+                UPSTREAM_REJECTIONS.inc(upstream=upstream, reason="circuit_open")
+                raise UpstreamUnavailableError(upstream, "circuit breaker open", method, url)
+            response = await self._send(upstream, operation, method, url, token, stream=stream, **kwargs)
+            if stream:
+                response.stream = _ReleasingStream(response.stream, bulkhead.release)
+                release = False
+            return response
+        finally:
+            if release:
+                bulkhead.release()
+
+    async def _send(self, upstream: str, operation: str, method: str, url: str, token: str,
+                    stream: bool = False, **kwargs) -> httpx.Response:
+        client = getattr(self, f"{upstream}_client")
+        breaker = self.breakers[upstream]
+        labels = {"upstream": upstream, "operation": operation}
+        status = "error"
+        failed = None
+        headers = self._get_headers(token)
+        remaining = remaining_budget()
+        if remaining is not None:
+            headers[DEADLINE_HEADER] = str(max(int(remaining * 1000), 0))
+        UPSTREAM_IN_FLIGHT.inc(**labels)
+        start = time.monotonic()
+        if stream:
+            # Streamed bodies are relayed as-is, so ask for them uncompressed.
+            headers["Accept-Encoding"] = "identity"
+        try:
+            if stream:
+                request = client.send(client.build_request(method, url, headers=headers, **kwargs), stream=True)
+            else:
+                request = client.request(method, url, headers=headers, **kwargs)
+            if remaining is None:
+                response = await request
+            else:
+                response = await asyncio.wait_for(request, timeout=max(remaining, 0))
+            status = str(response.status_code)
+            failed = response.status_code >= 500
+            return response
+        except asyncio.TimeoutError:
+            failed = False
+            raise UpstreamTimeoutError(upstream, "request deadline exceeded", method, url)
+        except httpx.TimeoutException:
+            failed = True
+            raise UpstreamTimeoutError(upstream, "upstream timed out", method, url)
+        except httpx.TransportError:
+            failed = True
+            raise
+        finally:
+            elapsed = time.monotonic() - start
+            if failed is None:
+                breaker.release()
+            else:
+                breaker.record(failed, elapsed)
+            UPSTREAM_IN_FLIGHT.dec(**labels)
+            UPSTREAM_LATENCY.observe(elapsed, **labels)
+            UPSTREAM_RESPONSES.inc(status=status, **labels)
+            context = current_context()
+            if context is not None:
+                context.record_upstream(upstream, elapsed * 1000)
+
+    async def _open_stream(self, upstream: str, operation: str, url: str, token: str) -> httpx.Response:
+        """
+        GETs `url` and returns the response with its body unread, bypassing caches and
+        request coalescing. The caller must aclose() it. Error responses are read,
+        closed and raised as HTTPStatusError, as with _get_json.
+        """
+        response = await self._request(upstream, operation, "GET", url, token, stream=True)
+        if response.is_error:
+            try:
+                await response.aread()
+            finally:
+                await response.aclose()
+            response.raise_for_status()
+        return response
+
+    async def _get_json(self, upstream: str, operation: str, url: str, token: str, params: Optional[dict] = None):
+        """
+        GETs `url` and returns the decoded body, recording its validator on the request
+        context for conditional GETs.
+        """
+        result, validator = await self._get_validated_json(upstream, operation, url, token, params)
+        self._record_validator(validator)
+        return result
+
+    async def _get_validated_json(self, upstream: str, operation: str, url: str, token: str,
+                                  params: Optional[dict] = None) -> Tuple[Any, str]:
+        """
+        GETs `url` and returns the decoded body with a validator: the upstream's strong
+        ETag when it sends one, otherwise a digest of the raw body. Concurrent identical
+        GETs share one upstream call when the callers fall in the same authorization
+        scope (see _share_scope).
+
+        A caller only shares a call whose deadline is at least as late as its own, so
+        the shared call forwards and runs under the latest deadline among its waiters
+        and one client's short budget cannot fail the others. Each caller stops waiting
+        when its own budget runs out, and the call is cancelled when the last one has.
+        """
+        key = (url, tuple(sorted(params.items())) if params else None, self._share_scope(upstream, operation, token))
+        remaining = remaining_budget()
+        if remaining is not None and remaining <= 0:
+            raise UpstreamTimeoutError(upstream, "request deadline exceeded", "GET", url)
+
+        async def fetch():
+            if self.config.HEDGING_ENABLED:
+                response = await self._hedged_get(upstream, operation, url, token, params)
+            else:
+                response = await self._request(upstream, operation, "GET", url, token, params=params)
+            response.raise_for_status()
+            etag = response.headers.get("ETag")
+            if not etag or etag.startswith("W/"):
+                etag = hashlib.blake2b(response.content, digest_size=16).hexdigest()
+            return response.json(), etag
+
+        memo = current_batch_memo()
+        if memo is None:
+            call = self.singleflight.do(key, fetch, current_deadline())
+        else:
+            # Within a batch, identical GETs share one result even when they do not overlap in time.
+            shared = memo.get(key)
+            if shared is None:
+                shared = memo[key] = asyncio.ensure_future(self.singleflight.do(key, fetch, current_deadline()))
+            call = asyncio.shield(shared)
+        if remaining is None:
+            return await call
+        try:
+            return await asyncio.wait_for(call, timeout=remaining)
+        except asyncio.TimeoutError:
+            raise UpstreamTimeoutError(upstream, "request deadline exceeded", "GET", url)
+
+    @staticmethod
+    def _share_scope(upstream: str, operation: str, token: str) -> Any:
+        """
+        The part of a shared GET's key that stands for the caller: nothing for Event
+        reads, which are public and already cached across callers; the verified profile
+        for ROLE_SHARED_OPERATIONS; and the verified subject and profile for every other
+        User and Ticket read, so no caller gets a response (or error) meant for another.
+        """
+        if upstream == "event":
+            return None
+        try:
+            claims = token_verifier.verify(token)
+        except InvalidTokenError:
+            # Unverifiable here: key on a fresh object so the call is never shared.
+            return object()
+        if operation in ROLE_SHARED_OPERATIONS:
+            return ("profile", claims.get("profile"))
+        subject = claims.get("sub") or claims.get("email")
+        if subject is None:
+            return object()
+        return ("subject", subject, claims.get("profile"))
+
+    @staticmethod
+    def _record_validator(validator: str):
+        context = current_context()
+        if context is not None:
+            context.record_validator(validator)
+
+    async def _hedged_get(self, upstream: str, operation: str, url: str, token: str, params: Optional[dict]) -> httpx.Response:
+        """
+        GET with request hedging. If the first attempt has not answered within the
+        operation's HEDGE_PERCENTILE latency, a second attempt is sent (budget
+        permitting) and whichever answers first wins; the other is cancelled.
+        """
+        tracker = self._latency_trackers.get((upstream, operation))
+        if tracker is None:
+            tracker = self._latency_trackers[(upstream, operation)] = LatencyTracker(
+                self.config.HEDGE_LATENCY_WINDOW, self.config.HEDGE_MIN_SAMPLES
+            )
+        self.hedge_budget.deposit()
+
+        async def attempt() -> httpx.Response:
+            start = time.monotonic()
+            response = await self._request(upstream, operation, "GET", url, token, params=params)
+            tracker.record(time.monotonic() - start)
+            return response
+
+        primary = asyncio.ensure_future(attempt())
+        delay = tracker.percentile(self.config.HEDGE_PERCENTILE)
+        if delay is None:
+            return await primary
+
+        attempts = {primary}
+        try:
+            done, _ = await asyncio.wait(attempts, timeout=max(delay, self.config.HEDGE_MIN_DELAY))
+            if done or not self.hedge_budget.try_spend():
+                return await primary
+
+            HEDGES_SENT.inc(upstream=upstream, operation=operation)
+            hedge = asyncio.ensure_future(attempt())
+            attempts.add(hedge)
+            while attempts:
+                done, attempts = await asyncio.wait(attempts, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    if task.exception() is None:
+                        if task is hedge:
+                            HEDGE_WINS.inc(upstream=upstream, operation=operation)
+                        return task.result()
+            return primary.result()
+        finally:
+            for task in attempts:
+                task.cancel()
+
+    async def check_health(self) -> Dict[str, dict]:
+        """
+        Reports the health of the User, Event and Ticket services. The checks run
+        concurrently and the report is reused for HEALTH_CACHE_TTL seconds, so
+        frequent probes do not multiply upstream traffic. Circuit breaker and bulkhead
+        state is always current.
+        """
+        report = self._health_report
+        if report is None or time.monotonic() - self._health_checked_at >= self.config.HEALTH_CACHE_TTL:
+            report = await self.singleflight.do(("health",), self._refresh_health)
+        return {
+            name: dict(
+                report[name],
+                circuit_breaker=self.breakers[upstream].snapshot(),
+                bulkhead=self.bulkheads[upstream].snapshot(),
+                background_bulkhead=self.background_bulkheads[upstream].snapshot(),
+                stream_bulkhead=self.stream_bulkheads[upstream].snapshot(),
+            )
+            for upstream, name in HEALTH_CHECK_NAMES.items()
+        }
+
+    async def _refresh_health(self) -> Dict[str, dict]:
+        user_health, event_health, ticket_health = await asyncio.gather(
+            self._check_dependency(self.user_client, self.config.USER_MGMT_URL),
+            self._check_dependency(self.event_client, self.config.EVENT_MGMT_URL),
+            self._check_dependency(self.ticket_client, self.config.TICKET_URL),
+        )
+        self._health_report = {
+            "user_management": user_health,
+            "event_management": event_health,
+            "event_booking": ticket_health,
+        }
+        self._health_checked_at = time.monotonic()
+        return self._health_report
+
+    async def _check_dependency(self, client: httpx.AsyncClient, base_url: str) -> dict:
+        start = time.monotonic()
+        try:
+            response = await asyncio.wait_for(client.get(f"{base_url}/health"), timeout=self.config.HEALTH_CHECK_TIMEOUT)
+            response.raise_for_status()
+            status, details = "healthy", response.json()
+        except httpx.HTTPStatusError as exc:
+            status, details = "unhealthy", exc.response.text
+        except asyncio.TimeoutError:
+            status, details = "unhealthy", f"Timed out after {self.config.HEALTH_CHECK_TIMEOUT}s"
+        except Exception as e:
+            status, details = "unhealthy", str(e)
+        return {
+            "status": status,
+            "latency_ms": round((time.monotonic() - start) * 1000, 2),
+            "details": details,
+        }
+
     async def get_user(self, user_id: str, token: str):
         url = f"{config.USER_MGMT_URL}/user/{user_id}"
-        response = await self.client.get(url, headers=self._get_headers(token))
-        response.raise_for_status()
-        return response.json()
+        return await self._get_json("user", "get_user", url, token)
 
     async def create_user(self, user_data: dict, token: str):
         url = f"{config.USER_MGMT_URL}/user"
-        response = await self.client.post(url, json=user_data, headers=self._get_headers(token))
+        response = await self._request("user", "create_user", "POST", url, token, json=user_data)
         response.raise_for_status()
         return response.json()
 
     async def authenticate_user(self, email: str, password: str, token: str):
         url = f"{config.USER_MGMT_URL}/user/authenticate"
-        response = await self.client.post(url, data={"email": email, "password": password}, headers=self._get_headers(token))
+        response = await self._request("user", "authenticate_user", "POST", url, token, data={"email": email, "password": password})
         response.raise_for_status()
         return response.json()
 
     async def modify_user(self, user_id: str, user_data: dict, token: str):
         url = f"{config.USER_MGMT_URL}/user"
         user_data["UID"] = user_id
-        response = await self.client.put(url, json=user_data, headers=self._get_headers(token))
+        response = await self._request("user", "modify_user", "PUT", url, token, json=user_data)
         response.raise_for_status()
         return response.json()
 
     async def delete_user(self, user_id: str, token: str):
         url = f"{config.USER_MGMT_URL}/user/{user_id}"
-        response = await self.client.delete(url, headers=self._get_headers(token))
+        response = await self._request("user", "delete_user", "DELETE", url, token)
         response.raise_for_status()
         return response.json()
 
+    def _invalidate_event(self, event_id: Optional[str]):
+        """
+        Drops the cached details of `event_id` (every event when unknown) and all cached listings,
+        and detaches in-flight event reads that may predate the write.
+        """
+        self.event_cache.invalidate_where(
+            lambda key: key[0] == "events" or event_id is None or key == ("event", event_id)
+        )
+        self.singleflight.forget(lambda key: key[0].startswith(f"{config.EVENT_MGMT_URL}/events"))
+        memo = current_batch_memo()
+        if memo is not None:
+            for key in [key for key in memo if key[0].startswith(f"{config.EVENT_MGMT_URL}/events")]:
+                del memo[key]
+
+    async def _cached_event_read(self, cache_key: tuple, ttl: Optional[float], fetch: Callable[[], Awaitable]):
+        """
+        Serves an event read from the cache. An entry up to EVENT_CACHE_STALE_WHILE_REVALIDATE
+        seconds past expiry is returned at once while one background refresh runs; if
+        the Event service fails, entries up to EVENT_CACHE_STALE_IF_ERROR seconds past
+        expiry are returned instead of the error. Stale responses are marked with
+        Warning and X-Cache-Status headers.
+        """
+        cached, stale_for = self.event_cache.lookup(cache_key)
+        if cached is not None and not stale_for:
+            return self._validated(cached)
+
+        if cached is not None and stale_for <= self.config.EVENT_CACHE_STALE_WHILE_REVALIDATE:
+            self._refresh_in_background(cache_key, ttl, fetch)
+            self._mark_stale('110 - "Response is Stale"')
+            return self._validated(cached)
+
+        generation = self.event_cache.generation
+        try:
+            result = await fetch()
+        except httpx.HTTPError as e:
+            upstream_failed = not isinstance(e, httpx.HTTPStatusError) or e.response.status_code >= 500
+            if cached is not None and upstream_failed and stale_for <= self.config.EVENT_CACHE_STALE_IF_ERROR:
+                self._mark_stale('111 - "Revalidation Failed"')
+                return self._validated(cached)
+            raise
+        self.event_cache.set(cache_key, result, ttl=ttl, generation=generation)
+        return self._validated(result)
+
+    def _validated(self, entry: Tuple[Any, str]):
+        # Event cache entries are (body, validator) pairs from _get_validated_json.
+        value, validator = entry
+        self._record_validator(validator)
+        return value
+
+    def _refresh_in_background(self, cache_key: tuple, ttl: Optional[float], fetch: Callable[[], Awaitable]):
+        """
+        Fetches `cache_key` into the event cache without waiting for it; at most one
+        refresh per key runs at a time.
+        """
+        if cache_key in self._revalidations:
+            return
+
+        async def refresh():
+            # The refresh outlives the request that triggered it.
+            detach_deadline()
+            set_context(None)
+            generation = self.event_cache.generation
+            try:
+                self.event_cache.set(cache_key, await fetch(), ttl=ttl, generation=generation)
+            except Exception as e:
+                logger.warning("Background event cache refresh failed", extra={"fields": {
+                    "cache_key": list(cache_key), "error": str(e),
+                }})
+            finally:
+                self._revalidations.pop(cache_key, None)
+
+        self._revalidations[cache_key] = asyncio.ensure_future(refresh())
+
+    @staticmethod
+    def _mark_stale(warning: str):
+        context = current_context()
+        if context is not None:
+            context.response_headers["Warning"] = warning
+            context.response_headers["X-Cache-Status"] = "stale"
+
     async def get_event(self, event_id: str, token: str):
+        # Event details do not depend on the caller, so entries are shared across tokens.
         url = f"{config.EVENT_MGMT_URL}/events/{event_id}"
-        response = await self.client.get(url, headers=self._get_headers(token))
-        response.raise_for_status()
-        return response.json()
+        return await self._cached_event_read(
+            ("event", event_id), None, lambda: self._get_validated_json("event", "get_event", url, token)
+        )
 
     async def get_all_events(self, limit: int = 10, offset: int = 0, token: str = ""):
+        return await self._cached_event_read(
+            ("events", limit, offset), self.config.EVENT_LIST_CACHE_TTL, self._events_list_fetch(limit, offset, token)
+        )
+
+    def _events_list_fetch(self, limit: int, offset: int, token: str) -> Callable[[], Awaitable]:
         url = f"{config.EVENT_MGMT_URL}/events?limit={limit}&offset={offset}"
-        response = await self.client.get(url, headers=self._get_headers(token))
-        response.raise_for_status()
-        return response.json()
+        return lambda: self._get_validated_json("event", "get_all_events", url, token)
+
+    async def get_events_page(self, limit: int, offset: int, token: str) -> Tuple[dict, bool]:
+        """
+        One page of the event listing, in the upstream's own envelope, and whether another
+        page follows. limit + 1 rows are requested so the look-ahead row answers has_next
+        without a second call; it is trimmed from a copy, never from the cached listing.
+        With EVENT_LIST_PREFETCH, the next page is fetched into the cache in the background.
+        """
+        listing = await self.get_all_events(limit=limit + 1, offset=offset, token=token)
+        rows = listing["result"]["data"]
+        has_next = len(rows) > limit
+        if has_next and self.config.EVENT_LIST_PREFETCH:
+            next_key = ("events", limit + 1, offset + limit)
+            if self.event_cache.get(next_key) is None:
+                self._refresh_in_background(
+                    next_key, self.config.EVENT_LIST_CACHE_TTL, self._events_list_fetch(limit + 1, offset + limit, token)
+                )
+        page = dict(listing)
+        page["result"] = dict(listing["result"], data=rows[:limit])
+        return page, has_next
+
+    async def stream_all_events(self, limit: int, offset: int, token: str) -> httpx.Response:
+        url = f"{config.EVENT_MGMT_URL}/events?limit={limit}&offset={offset}"
+        return await self._open_stream("event", "get_all_events", url, token)
 
     async def create_event(self, event_data: dict, token: str):
         url = f"{config.EVENT_MGMT_URL}/events"
-        response = await self.client.post(url, json=event_data, headers=self._get_headers(token))
+        response = await self._request("event", "create_event", "POST", url, token, json=event_data)
         response.raise_for_status()
         return response.json()
 
     async def update_event(self, event_data: dict, token: str):
         url = f"{config.EVENT_MGMT_URL}/events"
-        response = await self.client.put(url, json=event_data, headers=self._get_headers(token))
+        response = await self._request("event", "update_event", "PUT", url, token, json=event_data)
         response.raise_for_status()
+        self._invalidate_event(event_data.get("EID"))
         return response.json()
 
     async def patch_event_guests(self, event_id: str, guests_remaining: int, token: str):
         url = f"{config.EVENT_MGMT_URL}/events/{event_id}/guests_remaining"
         data = {"guests_remaining": guests_remaining}
-        response = await self.client.patch(url, json=data, headers=self._get_headers(token))
+        response = await self._request("event", "patch_event_guests", "PATCH", url, token, json=data)
         response.raise_for_status()
+        self._invalidate_event(event_id)
         return response.json()
 
     async def delete_event(self, event_id: str, token: str):
         url = f"{config.EVENT_MGMT_URL}/events/{event_id}"
-        response = await self.client.delete(url, headers=self._get_headers(token))
+        response = await self._request("event", "delete_event", "DELETE", url, token)
         response.raise_for_status()
+        self._invalidate_event(event_id)
         return response.json()
 
     async def book_ticket(self, booking_data: dict, token: str):
         url = f"{config.TICKET_URL}/ticket"
-        response = await self.client.post(url, json=booking_data, headers=self._get_headers(token))
+        response = await self._request("ticket", "book_ticket", "POST", url, token, json=booking_data)
         response.raise_for_status()
         return response.json()
 
     async def cancel_ticket(self, booking_id: str, token: str):
         url = f"{config.TICKET_URL}/ticket/{booking_id}"
-        response = await self.client.delete(url, headers=self._get_headers(token))
+        response = await self._request("ticket", "cancel_ticket", "DELETE", url, token)
         response.raise_for_status()
         return {"message": "Event booking canceled successfully"}
 
     async def fetch_ticket(self, booking_id: str, token: str):
         url = f"{config.TICKET_URL}/ticket/{booking_id}"
-        response = await self.client.get(url, headers=self._get_headers(token))
-        response.raise_for_status()
-        return response.json()
+        return await self._get_json("ticket", "fetch_ticket", url, token)
+
+    async def stream_ticket(self, booking_id: str, token: str) -> httpx.Response:
+        url = f"{config.TICKET_URL}/ticket/{booking_id}"
+        return await self._open_stream("ticket", "fetch_ticket", url, token)
 
     async def get_tickets_by_user(self, user_id: str, token: str):
         url = f"{self.config.TICKET_URL}/ticket?uid={user_id}"
-        response = await self.client.get(url, headers=self._get_headers(token))
-        response.raise_for_status()
-        return response.json()
+        return await self._get_json("ticket", "get_tickets_by_user", url, token)
 
 
     async def get_organiser(self, organiser_id: str, token: str):
         url = f"{self.config.USER_MGMT_URL}/organiser/{organiser_id}"
-        response = await self.client.get(url, headers=self._get_headers(token))
-        response.raise_for_status()
-        return response.json()
+        return await self._get_json("user", "get_organiser", url, token)
 
     async def create_organiser(self, organiser_data: dict, token: str):
         url = f"{self.config.USER_MGMT_URL}/organiser"
-        response = await self.client.post(url, json=organiser_data, headers=self._get_headers(token))
+        response = await self._request("user", "create_organiser", "POST", url, token, json=organiser_data)
         response.raise_for_status()
         return response.json()
 
     async def modify_organiser(self, organiser_id: str, organiser_data: dict, token: str):
         url = f"{self.config.USER_MGMT_URL}/organiser/{organiser_id}"
-        response = await self.client.put(url, json=organiser_data, headers=self._get_headers(token))
+        response = await self._request("user", "modify_organiser", "PUT", url, token, json=organiser_data)
         response.raise_for_status()
         return response.json()
 
     async def delete_organiser(self, organiser_id: str, token: str):
         url = f"{self.config.USER_MGMT_URL}/organiser/{organiser_id}"
-        response = await self.client.delete(url, headers=self._get_headers(token))
+        response = await self._request("user", "delete_organiser", "DELETE", url, token)
         response.raise_for_status()
         return response.json()
 
     async def get_user_by_email(self, email: str, token: str):
         url = f"{self.config.USER_MGMT_URL}/user"
-        response = await self.client.get(url, params={"email": email}, headers=self._get_headers(token))
-        response.raise_for_status()
-        return response.json()
+        return await self._get_json("user", "get_user_by_email", url, token, params={"email": email})
     
     async def get_organiser_by_email(self, email: str, token: str):
         url = f"{self.config.USER_MGMT_URL}/organiser"
-        response = await self.client.get(url, params={"email": email}, headers=self._get_headers(token))
-        response.raise_for_status()
-        return response.json()
+        return await self._get_json("user", "get_organiser_by_email", url, token, params={"email": email})
         
     async def get_tickets_and_events(self, user_id: str, limit: int = 10, offset: int = 0, token: str = ""):
         tickets_coroutine = self.get_tickets_by_user(user_id, token)
-        events_coroutine = self.get_all_events(limit=limit, offset=offset, token=token)
-        tickets_result, events_result = await asyncio.gather(tickets_coroutine, events_coroutine)
-        events = events_result['result']['data']
-
-        has_next = len(events) > limit
-        if has_next:
-            events = events[:limit]
+        events_coroutine = self.get_events_page(limit, offset, token)
+        tickets_result, (events_page, has_next) = await asyncio.gather(tickets_coroutine, events_coroutine)
 
-        has_prev = offset > 0
-
-        events_pagination = {
-            "limit": limit,
-            "offset": offset,
-            "has_next": has_next,
-            "has_prev": has_prev
+        return {
+            "tickets": tickets_result.get("tickets", []),
+            "events": events_page["result"]["data"],
+            "events_pagination": page_info(limit, offset, has_next)
         }
 
+    @staticmethod
+    async def _fetch_many(keys: List[str], fetch: Callable[[str], Awaitable],
+                          concurrency: int) -> Tuple[Dict[str, Any], Dict[str, Exception]]:
+        """
+        Calls `fetch` once per distinct key, at most `concurrency` at a time, and returns
+        (results, failures), both keyed by key and in first-seen order.
+        """
+        unique_keys = list(dict.fromkeys(keys))
+        semaphore = asyncio.Semaphore(concurrency)
+
+        async def bounded(key: str):
+            async with semaphore:
+                return await fetch(key)
+
+        outcomes = await asyncio.gather(*(bounded(key) for key in unique_keys), return_exceptions=True)
+        results, failures = {}, {}
+        for key, outcome in zip(unique_keys, outcomes):
+            if isinstance(outcome, Exception):
+                failures[key] = outcome
+            else:
+                results[key] = outcome
+        return results, failures
+
+    async def get_events(self, event_ids: List[str], token: str,
+                         concurrency: Optional[int] = None) -> Tuple[Dict[str, dict], Dict[str, dict]]:
+        """
+        Resolves many events by id through the event cache, fetching misses concurrently,
+        at most `concurrency` at a time. The Event service has no bulk lookup, so each
+        distinct id costs at most one upstream call. Returns (events, errors), both keyed
+        by id; errors carry the status code and detail of the failed lookup.
+        """
+        events, failures = await self._fetch_many(
+            event_ids, lambda event_id: self.get_event(event_id, token),
+            concurrency or self.config.EVENT_FETCH_CONCURRENCY,
+        )
+        errors = {}
+        for event_id, error in failures.items():
+            if isinstance(error, httpx.HTTPStatusError):
+                errors[event_id] = {"status_code": error.response.status_code, "detail": error.response.text}
+            else:
+                errors[event_id] = {"status_code": 500, "detail": str(error)}
+        return events, errors
+
+    async def get_enriched_tickets(self, user_id: str, token: str) -> dict:
+        """
+        The user's tickets, each joined to its event under "event" (None when the event
+        could not be loaded, with the reason in "event_errors").
+        """
+        tickets = (await self.get_tickets_by_user(user_id, token)).get("tickets", [])
+        events, errors = await self.get_events([ticket["EID"] for ticket in tickets if ticket.get("EID")], token)
         return {
-            "tickets": tickets_result.get("tickets", []),
-            "events": events,
-            "events_pagination": events_pagination
+            "tickets": [dict(ticket, event=events.get(ticket.get("EID"))) for ticket in tickets],
+            "event_errors": errors,
         }
 
     async def get_events_by_organizer(self, oid: str, limit: int, offset: int, token: str) -> List[dict]:
         url = f"{config.EVENT_MGMT_URL}/events/organizer/{oid}?limit={limit}&offset={offset}"
-        response = await self.client.get(url, headers=self._get_headers(token))
-        response.raise_for_status()
-        return response.json()
+        return await self._get_json("event", "get_events_by_organizer", url, token)
+
+    async def stream_events_by_organizer(self, oid: str, limit: int, offset: int, token: str) -> httpx.Response:
+        url = f"{config.EVENT_MGMT_URL}/events/organizer/{oid}?limit={limit}&offset={offset}"
+        return await self._open_stream("event", "get_events_by_organizer", url, token)
 
     async def update_guests_remaining(self, eid: str, guests_remaining: int, token: str) -> dict:
         url = f"{config.EVENT_MGMT_URL}/events/{eid}/{guests_remaining}"
-        response = await self.client.patch(url, headers=self._get_headers(token))
+        response = await self._request("event", "update_guests_remaining", "PATCH", url, token)
         response.raise_for_status()
+        self._invalidate_event(eid)
         return response.json()
 
     async def get_users_by_event(self, eid: str, limit: int, offset: int, token: str) -> List[dict]:
         url = f"{config.TICKET_URL}/ticket/event/{eid}/users?limit={limit}&offset={offset}"
-        response = await self.client.get(url, headers=self._get_headers(token))
-        response.raise_for_status()
-        return response.json()
+        return await self._get_json("ticket", "get_users_by_event", url, token)
 
-    async def invoke_send_email_lambda(self, booking_details: dict):
-        if not self.lambda_function_name:
-            print("Lambda function name not configured.")
-            return None
+    async def stream_users_by_event(self, eid: str, limit: int, offset: int, token: str) -> httpx.Response:
+        url = f"{config.TICKET_URL}/ticket/event/{eid}/users?limit={limit}&offset={offset}"
+        return await self._open_stream("ticket", "get_users_by_event", url, token)
+
+    async def get_user_profiles(self, user_ids: List[str], token: str, concurrency: Optional[int] = None) -> Dict[str, dict]:
+        """
+        Resolves user profiles concurrently, at most `concurrency` requests at a time.
+        Repeated UIDs are fetched once; profiles that fail to load are left out and
+        counted in one log record per call.
+        """
+        profiles, failures = await self._fetch_many(
+            user_ids, lambda user_id: self.get_user(user_id, token),
+            concurrency or self.config.PROFILE_FETCH_CONCURRENCY,
+        )
+        if failures:
+            user_id, error = next(iter(failures.items()))
+            logger.warning("Failed to fetch user profiles", extra={"fields": {
+                "failed": len(failures), "requested": len(profiles) + len(failures),
+                "first_user_id": user_id, "error": str(error),
+            }})
+        return profiles
+
+    async def iter_event_attendee_pages(self, eid: str, token: str, page_size: Optional[int] = None) -> AsyncIterator[List[str]]:
+        """
+        Yields the attendee UIDs of an event one page at a time. The next page is
+        requested before the current one is handed out, so paging overlaps with
+        whatever the consumer does with each page.
+        """
+        page_size = page_size or self.config.ATTENDEE_PAGE_SIZE
+        offset = 0
+        next_page = asyncio.ensure_future(self.get_users_by_event(eid, page_size, offset, token))
         try:
-            payload = json.dumps({'body': booking_details })
-            response = self.lambda_client.invoke(
-                FunctionName=self.lambda_function_name,
-                InvocationType='Event',
-                Payload=payload.encode('utf-8')
-            )
-            return response
-        except Exception as e:
-            print(f"Failed to invoke Lambda function: {e}")
-            return None
-
-    async def publish_event_update_notification(self, message):
-        if not self.sns_topic_arn:
-            return None
+            while next_page is not None:
+                page = await next_page
+                user_ids = [attendee['UID'] for attendee in page.get('uids', [])]
+                offset += page_size
+                next_page = None
+                if len(user_ids) == page_size:
+                    next_page = asyncio.ensure_future(self.get_users_by_event(eid, page_size, offset, token))
+                if user_ids:
+                    yield user_ids
+        finally:
+            if next_page is not None and not next_page.done():
+                next_page.cancel()
+
+    async def iter_event_attendee_emails(self, eid: str, token: str) -> AsyncIterator[List[str]]:
+        """
+        Yields the distinct attendee emails of each attendee page, so only one page
+        of UIDs and profiles is held in memory at a time.
+        """
+        async for user_ids in self.iter_event_attendee_pages(eid, token):
+            profiles = await self.get_user_profiles(user_ids, token)
+            user_emails = {
+                profile['details']['Email'] for profile in profiles.values()
+                if profile.get('details', {}).get('Email')
+            }
+            if user_emails:
+                yield sorted(user_emails)
+
+    async def notify_event_update(self, event_id: str, event_data: dict, token: str):
+        """
+        Publishes event update notifications to every attendee of `event_id`, one
+        message per attendee page. Runs after the response has been sent, so
+        failures are only logged.
+        """
+        detach_deadline()
+        mark_background()
         try:
-            response = self.sns_client.publish(
-                TopicArn=self.sns_topic_arn,
-                Message=json.dumps(message),
-                Subject='Event Updated Notification'
-            )
-            print(f"Published event update notification to SNS. Message ID: {response['MessageId']}")
-            return response
+            async for user_emails in self.iter_event_attendee_emails(event_id, token):
+                message = dict(event_data, UserEmails=user_emails)
+                await self.publish_event_update_notification(message)
         except Exception as e:
-            print(f"Failed to publish event update notification: {e}")
-            return None
+            logger.error("Failed to notify attendees", extra={"fields": {"event_id": event_id, "error": str(e)}})
 
+    async def invoke_send_email_lambda(self, booking_details: dict) -> bool:
+        """
+        Queues the booking confirmation email; delivery happens in the notification outbox.
+        """
+        if not self.lambda_function_name:
+            print("Lambda function name not configured.")
+            return False
+        payload = json.dumps({'body': booking_details })
+        return self.outbox.enqueue_lambda_invoke(self.lambda_function_name, payload.encode('utf-8'))
+
+    async def publish_event_update_notification(self, message) -> bool:
+        """
+        Queues an event update notification; delivery happens in the notification outbox.
+        """
+        if not self.sns_topic_arn:
+            return False
+        return self.outbox.enqueue_sns_publish(self.sns_topic_arn, json.dumps(message), 'Event Updated Notification')
@@ -0,0 +1,170 @@
+import asyncio
+import time
+import uuid
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+import httpx
+
+from app.middleware.logging import logger
+from app.utils.config import Config
+from app.utils.request_context import reset_deadline, set_deadline
+
+QUEUED = "queued"
+RUNNING = "running"
+SUCCEEDED = "succeeded"
+FAILED = "failed"
+
+
+class Job:
+    __slots__ = ("id", "kind", "owner", "status", "result", "error", "created_at", "started_at", "finished_at", "run")
+
+    def __init__(self, kind: str, owner: Optional[str], run: Callable[[], Awaitable[Any]]):
+        self.id = uuid.uuid4().hex
+        self.kind = kind
+        self.owner = owner
+        self.status = QUEUED
+        self.result: Any = None
+        self.error: Optional[dict] = None
+        self.created_at = time.time()
+        self.started_at: Optional[float] = None
+        self.finished_at: Optional[float] = None
+        self.run = run
+
+    @property
+    def finished(self) -> bool:
+        return self.status in (SUCCEEDED, FAILED)
+
+    def to_dict(self) -> dict:
+        return {
+            "job_id": self.id,
+            "kind": self.kind,
+            "status": self.status,
+            "result": self.result,
+            "error": self.error,
+            "created_at": self.created_at,
+            "started_at": self.started_at,
+            "finished_at": self.finished_at,
+        }
+
+
+class JobEngine:
+    """
+    In-process job queue for work accepted with 202 Accepted.
+
+    submit() enqueues and returns immediately, or returns None when the bounded queue
+    is full so the caller can push back. JOB_WORKERS worker tasks run jobs one at a
+    time each, under a JOB_TIMEOUT deadline, which caps the rate at which jobs reach
+    the upstreams. Jobs and their results are kept for JOB_RESULT_TTL seconds after
+    they finish.
+    """
+
+    def __init__(self, config: Optional[Config] = None):
+        self.config = config or Config()
+        self._queue: asyncio.Queue = asyncio.Queue(maxsize=self.config.JOB_QUEUE_SIZE)
+        self._jobs: "OrderedDict[str, Job]" = OrderedDict()
+        self._workers: List[asyncio.Task] = []
+        self._purged_at = 0.0
+
+        self.submitted = 0
+        self.rejected = 0
+        self.succeeded = 0
+        self.failed = 0
+
+    def start(self):
+        if not self._workers:
+            self._workers = [asyncio.ensure_future(self._worker()) for _ in range(self.config.JOB_WORKERS)]
+
+    async def stop(self):
+        """
+        Waits up to JOB_DRAIN_TIMEOUT for queued jobs to finish, then stops the workers.
+        """
+        if not self._workers:
+            return
+        try:
+            await asyncio.wait_for(self._queue.join(), timeout=self.config.JOB_DRAIN_TIMEOUT)
+        except asyncio.TimeoutError:
+            logger.warning("Job engine stopped with queued jobs", extra={"fields": {"queued": self._queue.qsize()}})
+        for worker in self._workers:
+            worker.cancel()
+        await asyncio.gather(*self._workers, return_exceptions=True)
+        self._workers = []
+
+    def submit(self, kind: str, owner: Optional[str], run: Callable[[], Awaitable[Any]]) -> Optional[Job]:
+        job = Job(kind, owner, run)
+        try:
+            self._queue.put_nowait(job)
+        except asyncio.QueueFull:
+            self.rejected += 1
+            return None
+        self.submitted += 1
+        self._jobs[job.id] = job
+        self._purge()
+        return job
+
+    def get(self, job_id: str) -> Optional[Job]:
+        self._purge()
+        return self._jobs.get(job_id)
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "depth": self._queue.qsize(),
+            "stored": len(self._jobs),
+            "submitted": self.submitted,
+            "rejected": self.rejected,
+            "succeeded": self.succeeded,
+            "failed": self.failed,
+        }
+
+    def _purge(self):
+        """
+        Drops finished jobs past JOB_RESULT_TTL, then the oldest finished jobs while the
+        store holds more than JOB_STORE_SIZE. Runs at most once a second.
+        """
+        now = time.time()
+        if now - self._purged_at < 1.0 and len(self._jobs) <= self.config.JOB_STORE_SIZE:
+            return
+        self._purged_at = now
+        for job_id in [
+            job_id for job_id, job in self._jobs.items()
+            if job.finished and now - job.finished_at >= self.config.JOB_RESULT_TTL
+        ]:
+            del self._jobs[job_id]
+        excess = len(self._jobs) - self.config.JOB_STORE_SIZE
+        if excess > 0:
+            for job_id in [job_id for job_id, job in self._jobs.items() if job.finished][:excess]:
+                del self._jobs[job_id]
+
+    async def _worker(self):
+        while True:
+            job = await self._queue.get()
+            try:
+                await self._execute(job)
+            finally:
+                self._queue.task_done()
+
+    async def _execute(self, job: Job):
+        job.status = RUNNING
+        job.started_at = time.time()
+        token = set_deadline(time.monotonic() + self.config.JOB_TIMEOUT)
+        try:
+            job.result = await job.run()
+            job.status = SUCCEEDED
+            self.succeeded += 1
+        except asyncio.CancelledError:
+            job.status = FAILED
+            job.error = {"detail": "Job cancelled during shutdown"}
+            self.failed += 1
+            raise
+        except httpx.HTTPStatusError as e:
+            job.status = FAILED
+            job.error = {"status_code": e.response.status_code, "detail": e.response.text}
+            self.failed += 1
+        except Exception as e:
+            job.status = FAILED
+            job.error = {"detail": str(e)}
+            self.failed += 1
+        finally:
+            reset_deadline(token)
+            job.finished_at = time.time()
+            job.run = None
@@ -0,0 +1,216 @@
+import asyncio
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional
+
+from app.middleware.logging import logger
+from app.utils.config import Config
+
+LAMBDA_INVOKE = "lambda_invoke"
+SNS_PUBLISH = "sns_publish"
+
+
+class OutboxMessage:
+    __slots__ = ("kind", "payload", "enqueued_at", "attempts")
+
+    def __init__(self, kind: str, payload: dict):
+        self.kind = kind
+        self.payload = payload
+        self.enqueued_at = time.monotonic()
+        self.attempts = 0
+
+
+class NotificationOutbox:
+    """
+    In-process outbox for AWS notifications.
+
+    Callers enqueue and return immediately; a pool of worker tasks drains the queue
+    and runs the blocking boto3 calls on a thread pool, so the event loop never waits
+    on an AWS round-trip. SNS messages for the same topic are sent with publish_batch,
+    and failed deliveries are retried with exponential backoff.
+    """
+
+    def __init__(self, lambda_client, sns_client, config: Optional[Config] = None):
+        self.config = config or Config()
+        self.lambda_client = lambda_client
+        self.sns_client = sns_client
+
+        self._queue: asyncio.Queue = asyncio.Queue(maxsize=self.config.NOTIFICATION_QUEUE_SIZE)
+        self._executor = ThreadPoolExecutor(
+            max_workers=self.config.NOTIFICATION_WORKERS, thread_name_prefix="notification-outbox"
+        )
+        self._workers: List[asyncio.Task] = []
+        self._retry_handles = set()
+
+        self.enqueued = 0
+        self.sent = 0
+        self.failed = 0
+        self.retried = 0
+        self.dropped = 0
+        self.latency_total_ms = 0.0
+        self.latency_max_ms = 0.0
+
+    def start(self):
+        if not self._workers:
+            self._workers = [
+                asyncio.ensure_future(self._worker()) for _ in range(self.config.NOTIFICATION_WORKERS)
+            ]
+
+    async def stop(self):
+        """
+        Waits up to NOTIFICATION_DRAIN_TIMEOUT for queued messages to be delivered,
+        then stops the workers. Pending retries are abandoned.
+        """
+        if self._workers:
+            try:
+                await asyncio.wait_for(self._queue.join(), timeout=self.config.NOTIFICATION_DRAIN_TIMEOUT)
+            except asyncio.TimeoutError:
+                logger.warning("Notification outbox stopped with undelivered messages", extra={"fields": {
+                    "undelivered": self._queue.qsize(),
+                }})
+            for worker in self._workers:
+                worker.cancel()
+            await asyncio.gather(*self._workers, return_exceptions=True)
+            self._workers = []
+        for handle in self._retry_handles:
+            handle.cancel()
+        self._retry_handles.clear()
+        self._executor.shutdown(wait=False)
+
+    def enqueue_lambda_invoke(self, function_name: str, payload: bytes) -> bool:
+        return self._enqueue(OutboxMessage(LAMBDA_INVOKE, {
+            "FunctionName": function_name,
+            "InvocationType": "Event",
+            "Payload": payload,
+        }))
+
+    def enqueue_sns_publish(self, topic_arn: str, message: str, subject: str) -> bool:
+        return self._enqueue(OutboxMessage(SNS_PUBLISH, {
+            "TopicArn": topic_arn,
+            "Message": message,
+            "Subject": subject,
+        }))
+
+    def _enqueue(self, message: OutboxMessage) -> bool:
+        try:
+            self._queue.put_nowait(message)
+        except asyncio.QueueFull:
+            self.dropped += 1
+            logger.warning("Notification outbox full, dropping message", extra={"fields": {"kind": message.kind}})
+            return False
+        if message.attempts == 0:
+            self.enqueued += 1
+        return True
+
+    def stats(self) -> Dict[str, float]:
+        return {
+            "depth": self._queue.qsize(),
+            "enqueued": self.enqueued,
+            "sent": self.sent,
+            "failed": self.failed,
+            "retried": self.retried,
+            "dropped": self.dropped,
+            "latency_avg_ms": self.latency_total_ms / self.sent if self.sent else 0.0,
+            "latency_max_ms": self.latency_max_ms,
+        }
+
+    async def _worker(self):
+        while True:
+            batch = [await self._queue.get()]
+            while len(batch) < self.config.NOTIFICATION_BATCH_SIZE and not self._queue.empty():
+                batch.append(self._queue.get_nowait())
+            try:
+                await self._deliver(batch)
+            except Exception as e:
+                logger.error("Notification outbox worker error", extra={"fields": {"error": str(e)}})
+            finally:
+                for _ in batch:
+                    self._queue.task_done()
+
+    async def _deliver(self, batch: List[OutboxMessage]):
+        by_topic: Dict[str, List[OutboxMessage]] = {}
+        deliveries = []
+        for message in batch:
+            if message.kind == SNS_PUBLISH:
+                by_topic.setdefault(message.payload["TopicArn"], []).append(message)
+            else:
+                deliveries.append(self._invoke_lambda(message))
+        for topic_arn, messages in by_topic.items():
+            deliveries.append(self._publish_sns(topic_arn, messages))
+        await asyncio.gather(*deliveries)
+
+    async def _run(self, fn, **kwargs):
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, lambda: fn(**kwargs))
+
+    async def _invoke_lambda(self, message: OutboxMessage):
+        try:
+            await self._run(self.lambda_client.invoke, **message.payload)
+            self._delivered(message)
+        except Exception as e:
+            self._retry(message, e)
+
+    async def _publish_sns(self, topic_arn: str, messages: List[OutboxMessage]):
+        if len(messages) == 1:
+            message = messages[0]
+            try:
+                await self._run(self.sns_client.publish, **message.payload)
+                self._delivered(message)
+            except Exception as e:
+                self._retry(message, e)
+            return
+
+        entries = [
+            {"Id": str(index), "Message": message.payload["Message"], "Subject": message.payload["Subject"]}
+            for index, message in enumerate(messages)
+        ]
+        try:
+            response = await self._run(
+                self.sns_client.publish_batch, TopicArn=topic_arn, PublishBatchRequestEntries=entries
+            )
+        except Exception as e:
+            for message in messages:
+                self._retry(message, e)
+            return
+
+        for entry in response.get("Successful", []):
+            self._delivered(messages[int(entry["Id"])])
+        for entry in response.get("Failed", []):
+            message = messages[int(entry["Id"])]
+            error = entry.get("Message", entry.get("Code"))
+            if entry.get("SenderFault"):
+                self._give_up(message, error)
+            else:
+                self._retry(message, error)
+
+    def _delivered(self, message: OutboxMessage):
+        latency_ms = (time.monotonic() - message.enqueued_at) * 1000
+        self.sent += 1
+        self.latency_total_ms += latency_ms
+        self.latency_max_ms = max(self.latency_max_ms, latency_ms)
+
+    def _retry(self, message: OutboxMessage, error):
+        message.attempts += 1
+        if message.attempts > self.config.NOTIFICATION_MAX_RETRIES:
+            self._give_up(message, error)
+            return
+        self.retried += 1
+        delay = min(
+            self.config.NOTIFICATION_RETRY_BASE_DELAY * (2 ** (message.attempts - 1)),
+            self.config.NOTIFICATION_RETRY_MAX_DELAY,
+        )
+        loop = asyncio.get_running_loop()
+        handle = None
+
+        def requeue():
+            self._retry_handles.discard(handle)
+            self._enqueue(message)
+
+        handle = loop.call_later(delay, requeue)
+        self._retry_handles.add(handle)
+
+    def _give_up(self, message: OutboxMessage, error):
+        self.failed += 1
+        logger.error("Failed to deliver notification", extra={"fields": {
+            "kind": message.kind, "attempts": message.attempts, "error": str(error),
+        }})
@@ -0,0 +1,61 @@
+import threading
+import time
+from collections import OrderedDict
+from typing import Optional, Tuple
+
+import jwt
+from jwt import ExpiredSignatureError, InvalidTokenError
+
+from app.utils.config import Config
+
+
+class TokenVerifier:
+    """
+    Verifies JWTs and keeps a bounded LRU of recently verified tokens.
+
+    A cached token is only served while its `exp` claim is in the future, so hot
+    tokens skip signature and base64 work entirely without outliving their expiry.
+    The returned claims dict is shared between callers and must not be mutated.
+    """
+
+    def __init__(self, secret_key: Optional[str], algorithm: str, max_size: int):
+        self.secret_key = secret_key
+        self.algorithm = algorithm
+        self.max_size = max_size
+        self._cache: "OrderedDict[str, Tuple[dict, Optional[float]]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def verify(self, token: str) -> dict:
+        if not self.secret_key:
+            #Fail closed: without a secret no token can be trusted.
+            raise InvalidTokenError("JWT secret is not configured")
+        with self._lock:
+            cached = self._cache.get(token)
+            if cached is not None:
+                claims, expires_at = cached
+                if expires_at is None or expires_at > time.time():
+                    self._cache.move_to_end(token)
+                    return claims
+                del self._cache[token]
+                raise ExpiredSignatureError("Signature has expired")
+
+        claims = jwt.decode(token, key=self.secret_key, algorithms=[self.algorithm])
+        exp = claims.get("exp")
+        expires_at = float(exp) if exp is not None else None
+
+        if self.max_size > 0:
+            with self._lock:
+                self._cache[token] = (claims, expires_at)
+                self._cache.move_to_end(token)
+                while len(self._cache) > self.max_size:
+                    self._cache.popitem(last=False)
+        return claims
+
+    def clear(self):
+        with self._lock:
+            self._cache.clear()
+
+
+config = Config()
+
+token_verifier = TokenVerifier(config.JWT_SECRET_KEY, config.JWT_ALGORITHM, config.AUTH_CACHE_SIZE)
@@ -0,0 +1,90 @@
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, Optional, Tuple
+
+
+class TTLCache:
+    """
+    Bounded in-memory LRU cache with a time-to-live per entry.
+
+    `generation` is bumped on every invalidation. A caller that reads the generation
+    before fetching and passes it to set() will not store a value that was fetched
+    before a concurrent invalidation.
+
+    With `stale_ttl`, expired entries are kept that many seconds longer so lookup()
+    can still return them, letting callers serve stale data while they refresh.
+    """
+
+    def __init__(self, max_size: int, ttl: float, stale_ttl: float = 0.0):
+        self.max_size = max_size
+        self.ttl = ttl
+        self.stale_ttl = stale_ttl
+        self.generation = 0
+        self._entries: "OrderedDict[Hashable, tuple]" = OrderedDict()
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.stale_hits = 0
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        value, stale_for = self.lookup(key)
+        if stale_for:
+            # A plain get() only wants fresh values; the stale hit is a miss here.
+            self.stale_hits -= 1
+            self.misses += 1
+            return None
+        return value
+
+    def lookup(self, key: Hashable) -> Tuple[Optional[Any], float]:
+        """
+        Returns (value, seconds past expiry): 0 for a fresh entry, > 0 for a stale one
+        still within `stale_ttl`, and (None, 0) on a miss.
+        """
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None, 0.0
+        value, expires_at = entry
+        now = time.monotonic()
+        if expires_at + self.stale_ttl <= now:
+            del self._entries[key]
+            self.misses += 1
+            return None, 0.0
+        self._entries.move_to_end(key)
+        if expires_at <= now:
+            self.stale_hits += 1
+            return value, now - expires_at
+        self.hits += 1
+        return value, 0.0
+
+    def set(self, key: Hashable, value: Any, ttl: Optional[float] = None, generation: Optional[int] = None):
+        if generation is not None and generation != self.generation:
+            return
+        self._entries[key] = (value, time.monotonic() + (self.ttl if ttl is None else ttl))
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def invalidate(self, key: Hashable):
+        self.generation += 1
+        self._entries.pop(key, None)
+
+    def invalidate_where(self, predicate: Callable[[Hashable], bool]):
+        self.generation += 1
+        for key in [key for key in self._entries if predicate(key)]:
+            del self._entries[key]
+
+    def clear(self):
+        self.generation += 1
+        self._entries.clear()
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "size": len(self._entries),
+            "hits": self.hits,
+            "misses": self.misses,
+            "stale_hits": self.stale_hits,
+            "evictions": self.evictions,
+        }
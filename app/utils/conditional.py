@@ -0,0 +1,46 @@
+import hashlib
+from typing import Optional
+
+from starlette.requests import Request
+from starlette.responses import Response
+
+from app.utils.request_context import current_context
+
+#Clients may store responses but must revalidate them with If-None-Match before reuse.
+CACHE_CONTROL = "private, no-cache"
+
+
+def _etag(request: Request, validators) -> str:
+    digest = hashlib.blake2b(digest_size=16)
+    digest.update(request.url.path.encode())
+    digest.update(str(sorted(request.query_params.multi_items())).encode())
+    for validator in sorted(validators):
+        digest.update(b"\n" + validator.encode())
+    return f'"{digest.hexdigest()}"'
+
+
+def _matches(if_none_match: str, etag: str) -> bool:
+    candidates = [candidate.strip() for candidate in if_none_match.split(",")]
+    # If-None-Match uses the weak comparison function.
+    return "*" in candidates or any(candidate.removeprefix("W/") == etag for candidate in candidates)
+
+
+def check_not_modified(request: Request) -> Optional[Response]:
+    """
+    Derives a strong ETag for the current response from the path, the query and the
+    validators of the upstream data fetched for it, and queues it with Cache-Control
+    on the request context. Returns a 304 to send instead of the body when the
+    client's If-None-Match already has that ETag, so the body is never serialized.
+    """
+    context = current_context()
+    if context is None or not context.validators:
+        return None
+
+    etag = _etag(request, context.validators)
+    context.response_headers["ETag"] = etag
+    context.response_headers["Cache-Control"] = CACHE_CONTROL
+
+    if_none_match = request.headers.get("If-None-Match")
+    if if_none_match and _matches(if_none_match, etag):
+        return Response(status_code=304)
+    return None
@@ -1,4 +1,6 @@
+import json
 import os
+from typing import Optional
 from dotenv import load_dotenv
 
 load_dotenv()
@@ -12,4 +14,105 @@ class Config:
     #Composite Service Configurations
     COMPOSITE_SERVICE_PORT: int = int(os.getenv("COMPOSITE_SERVICE_PORT", 8003))
 
+    #Upstream connection pool (one pool per microservice)
+    UPSTREAM_MAX_CONNECTIONS: int = int(os.getenv("UPSTREAM_MAX_CONNECTIONS", 100))
+    UPSTREAM_MAX_KEEPALIVE_CONNECTIONS: int = int(os.getenv("UPSTREAM_MAX_KEEPALIVE_CONNECTIONS", 20))
+    UPSTREAM_KEEPALIVE_EXPIRY: float = float(os.getenv("UPSTREAM_KEEPALIVE_EXPIRY", 30.0))
 
+    #Upstream timeouts (seconds)
+    UPSTREAM_CONNECT_TIMEOUT: float = float(os.getenv("UPSTREAM_CONNECT_TIMEOUT", 5.0))
+    UPSTREAM_READ_TIMEOUT: float = float(os.getenv("UPSTREAM_READ_TIMEOUT", 10.0))
+    UPSTREAM_WRITE_TIMEOUT: float = float(os.getenv("UPSTREAM_WRITE_TIMEOUT", 10.0))
+    UPSTREAM_POOL_TIMEOUT: float = float(os.getenv("UPSTREAM_POOL_TIMEOUT", 5.0))
+
+    #Authentication
+    #No default: the gateway refuses to start without a secret (see app.main.lifespan).
+    JWT_SECRET_KEY: Optional[str] = os.getenv("JWT_SECRET_KEY")
+    JWT_ALGORITHM: str = os.getenv("JWT_ALGORITHM", "HS256")
+    AUTH_CACHE_SIZE: int = int(os.getenv("AUTH_CACHE_SIZE", 10000))
+
+    #Attendee profile resolution for event update notifications
+    PROFILE_FETCH_CONCURRENCY: int = int(os.getenv("PROFILE_FETCH_CONCURRENCY", 10))
+    #Resolving many events at once (enriched tickets, /composite/events:batch)
+    EVENT_FETCH_CONCURRENCY: int = int(os.getenv("EVENT_FETCH_CONCURRENCY", 10))
+    EVENT_BATCH_MAX_IDS: int = int(os.getenv("EVENT_BATCH_MAX_IDS", 200))
+    ATTENDEE_PAGE_SIZE: int = int(os.getenv("ATTENDEE_PAGE_SIZE", 100))
+
+    #Notification outbox (Lambda emails and SNS event updates)
+    NOTIFICATION_QUEUE_SIZE: int = int(os.getenv("NOTIFICATION_QUEUE_SIZE", 10000))
+    NOTIFICATION_WORKERS: int = int(os.getenv("NOTIFICATION_WORKERS", 4))
+    NOTIFICATION_BATCH_SIZE: int = int(os.getenv("NOTIFICATION_BATCH_SIZE", 10))
+    NOTIFICATION_MAX_RETRIES: int = int(os.getenv("NOTIFICATION_MAX_RETRIES", 5))
+    NOTIFICATION_RETRY_BASE_DELAY: float = float(os.getenv("NOTIFICATION_RETRY_BASE_DELAY", 0.5))
+    NOTIFICATION_RETRY_MAX_DELAY: float = float(os.getenv("NOTIFICATION_RETRY_MAX_DELAY", 30.0))
+    NOTIFICATION_DRAIN_TIMEOUT: float = float(os.getenv("NOTIFICATION_DRAIN_TIMEOUT", 10.0))
+    AWS_STUB_CLIENTS: bool = os.getenv("AWS_STUB_CLIENTS", "false").lower() == "true"
+
+    #Async job engine (202 Accepted event creation)
+    JOB_QUEUE_SIZE: int = int(os.getenv("JOB_QUEUE_SIZE", 1000))
+    JOB_WORKERS: int = int(os.getenv("JOB_WORKERS", 4))
+    JOB_TIMEOUT: float = float(os.getenv("JOB_TIMEOUT", 60.0))
+    JOB_RESULT_TTL: float = float(os.getenv("JOB_RESULT_TTL", 3600.0))
+    JOB_STORE_SIZE: int = int(os.getenv("JOB_STORE_SIZE", 10000))
+    JOB_DRAIN_TIMEOUT: float = float(os.getenv("JOB_DRAIN_TIMEOUT", 10.0))
+    JOB_RETRY_AFTER: int = int(os.getenv("JOB_RETRY_AFTER", 5))
+
+    #Idempotency-Key replay store for bookings and creations
+    IDEMPOTENCY_TTL: float = float(os.getenv("IDEMPOTENCY_TTL", 86400.0))
+    IDEMPOTENCY_STORE_SIZE: int = int(os.getenv("IDEMPOTENCY_STORE_SIZE", 10000))
+
+    #POST /composite/batch
+    BATCH_MAX_ITEMS: int = int(os.getenv("BATCH_MAX_ITEMS", 20))
+    BATCH_MAX_CONCURRENCY: int = int(os.getenv("BATCH_MAX_CONCURRENCY", 6))
+
+    #Event read cache
+    EVENT_CACHE_SIZE: int = int(os.getenv("EVENT_CACHE_SIZE", 1000))
+    EVENT_CACHE_TTL: float = float(os.getenv("EVENT_CACHE_TTL", 30.0))
+    EVENT_LIST_CACHE_TTL: float = float(os.getenv("EVENT_LIST_CACHE_TTL", 10.0))
+    #Seconds past expiry an event read is still served while one background refresh runs,
+    #and while the Event service is failing.
+    EVENT_CACHE_STALE_WHILE_REVALIDATE: float = float(os.getenv("EVENT_CACHE_STALE_WHILE_REVALIDATE", 30.0))
+    EVENT_CACHE_STALE_IF_ERROR: float = float(os.getenv("EVENT_CACHE_STALE_IF_ERROR", 300.0))
+    #Fetch the next page of event listings into the cache while the client renders the current one.
+    EVENT_LIST_PREFETCH: bool = os.getenv("EVENT_LIST_PREFETCH", "false").lower() == "true"
+
+    #Composite health check
+    HEALTH_CHECK_TIMEOUT: float = float(os.getenv("HEALTH_CHECK_TIMEOUT", 2.0))
+    HEALTH_CACHE_TTL: float = float(os.getenv("HEALTH_CACHE_TTL", 5.0))
+
+    #Request logging
+    LOG_QUEUE_SIZE: int = int(os.getenv("LOG_QUEUE_SIZE", 10000))
+    LOG_SAMPLE_RATE: float = float(os.getenv("LOG_SAMPLE_RATE", 1.0))
+    LOG_SLOW_REQUEST_MS: float = float(os.getenv("LOG_SLOW_REQUEST_MS", 1000.0))
+
+    #Circuit breaker and bulkhead per upstream service
+    CIRCUIT_BREAKER_WINDOW: int = int(os.getenv("CIRCUIT_BREAKER_WINDOW", 50))
+    CIRCUIT_BREAKER_MIN_CALLS: int = int(os.getenv("CIRCUIT_BREAKER_MIN_CALLS", 20))
+    CIRCUIT_BREAKER_FAILURE_RATE: float = float(os.getenv("CIRCUIT_BREAKER_FAILURE_RATE", 0.5))
+    CIRCUIT_BREAKER_SLOW_CALL_SECONDS: float = float(os.getenv("CIRCUIT_BREAKER_SLOW_CALL_SECONDS", 3.0))
+    CIRCUIT_BREAKER_SLOW_CALL_RATE: float = float(os.getenv("CIRCUIT_BREAKER_SLOW_CALL_RATE", 0.8))
+    CIRCUIT_BREAKER_OPEN_SECONDS: float = float(os.getenv("CIRCUIT_BREAKER_OPEN_SECONDS", 30.0))
+    CIRCUIT_BREAKER_HALF_OPEN_CALLS: int = int(os.getenv("CIRCUIT_BREAKER_HALF_OPEN_CALLS", 3))
+    BULKHEAD_MAX_CONCURRENCY: int = int(os.getenv("BULKHEAD_MAX_CONCURRENCY", 50))
+    BULKHEAD_MAX_WAIT: float = float(os.getenv("BULKHEAD_MAX_WAIT", 0.05))
+    #Background work (attendee notification fan-out) gets its own, smaller bulkheads and
+    #waits for a slot instead of failing fast, so it neither starves nor is starved by requests.
+    BACKGROUND_BULKHEAD_MAX_CONCURRENCY: int = int(os.getenv("BACKGROUND_BULKHEAD_MAX_CONCURRENCY", 20))
+    BACKGROUND_BULKHEAD_MAX_WAIT: float = float(os.getenv("BACKGROUND_BULKHEAD_MAX_WAIT", 30.0))
+    #Streamed reads (?stream=true) hold their slot until the client has read the body, so
+    #they get bulkheads of their own and slow readers cannot starve the other requests.
+    STREAM_BULKHEAD_MAX_CONCURRENCY: int = int(os.getenv("STREAM_BULKHEAD_MAX_CONCURRENCY", 20))
+
+    #Request deadlines (seconds). ROUTE_DEADLINES is a JSON object of path prefix -> seconds,
+    #e.g. {"/composite/events": 5}. Clients may shorten the budget with X-Request-Timeout (ms).
+    REQUEST_DEADLINE_SECONDS: float = float(os.getenv("REQUEST_DEADLINE_SECONDS", 15.0))
+    ROUTE_DEADLINES: dict = json.loads(os.getenv("ROUTE_DEADLINES", "{}"))
+    DEADLINE_GRACE_SECONDS: float = float(os.getenv("DEADLINE_GRACE_SECONDS", 1.0))
+
+    #Hedged requests for idempotent upstream GETs
+    HEDGING_ENABLED: bool = os.getenv("HEDGING_ENABLED", "false").lower() == "true"
+    HEDGE_PERCENTILE: float = float(os.getenv("HEDGE_PERCENTILE", 0.95))
+    HEDGE_MIN_DELAY: float = float(os.getenv("HEDGE_MIN_DELAY", 0.005))
+    HEDGE_MIN_SAMPLES: int = int(os.getenv("HEDGE_MIN_SAMPLES", 20))
+    HEDGE_LATENCY_WINDOW: int = int(os.getenv("HEDGE_LATENCY_WINDOW", 200))
+    HEDGE_BUDGET_PERCENT: float = float(os.getenv("HEDGE_BUDGET_PERCENT", 5.0))
@@ -1,14 +1,35 @@
-import os
-
-import jwt
 from fastapi import Request, HTTPException
 from jwt import ExpiredSignatureError
 from jwt import InvalidTokenError
 
+from app.services.composite_service import CompositeService
+from app.utils.auth import token_verifier
+
+
+def get_composite_service(request: Request) -> CompositeService:
+    """
+    Returns the process-wide CompositeService created in the application lifespan.
+    """
+    return request.app.state.composite_service
 
 def get_token(request: Request) -> str:
+    token = getattr(request.state, "token", None)
+    if token is not None:
+        return token
     return extract_access_token_from_header(request)
 
+def get_claims(request: Request) -> dict:
+    """
+    Returns the claims verified by AuthMiddleware for this request, verifying the
+    token here only when the middleware did not run.
+    """
+    claims = getattr(request.state, "claims", None)
+    if claims is None:
+        claims = verify_token(get_token(request))
+        request.state.claims = claims
+        request.state.profile = claims.get('profile')
+    return claims
+
 def extract_access_token_from_header(request: Request):
     auth_header = request.headers.get("Authorization")
     if not auth_header or not auth_header.startswith("Bearer "):
@@ -16,19 +37,18 @@ def extract_access_token_from_header(request: Request):
 
     return auth_header.split(" ")[1]
 
-def verify_custom_jwt(token, profile):
+def verify_token(token: str) -> dict:
     try:
-        decoded_token = jwt.decode(
-            token,
-            key=os.getenv('JWT_SECRET_KEY'),
-            algorithms=['HS256']
-        )
-        if decoded_token.get('profile') != profile:
-            raise HTTPException(status_code=403, detail="Access denied.")
-
-        return decoded_token
-
+        return token_verifier.verify(token)
     except ExpiredSignatureError:
         raise HTTPException(status_code=401, detail="The auth token has expired")
     except InvalidTokenError:
         raise HTTPException(status_code=401, detail="The auth token is invalid")
+
+def require_profile(claims: dict, *profiles: str) -> dict:
+    if claims.get('profile') not in profiles:
+        raise HTTPException(status_code=403, detail="Access denied.")
+    return claims
+
+def verify_custom_jwt(token, profile):
+    return require_profile(verify_token(token), profile)
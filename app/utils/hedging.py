@@ -0,0 +1,47 @@
+from collections import deque
+from typing import Optional
+
+
+class LatencyTracker:
+    """
+    Keeps the latencies of the last `window` successful calls of one operation and
+    derives the hedging delay from them.
+    """
+
+    def __init__(self, window: int, min_samples: int):
+        self.min_samples = min_samples
+        self._samples = deque(maxlen=window)
+
+    def record(self, seconds: float):
+        self._samples.append(seconds)
+
+    def percentile(self, q: float) -> Optional[float]:
+        """
+        The q-th latency percentile, or None until `min_samples` calls have been seen.
+        """
+        if len(self._samples) < self.min_samples:
+            return None
+        ordered = sorted(self._samples)
+        return ordered[min(int(len(ordered) * q), len(ordered) - 1)]
+
+
+class HedgeBudget:
+    """
+    Token bucket that limits hedges to `percent` of primary requests: every request
+    deposits percent/100 of a token and every hedge spends one, with at most
+    `max_tokens` saved up for bursts.
+    """
+
+    def __init__(self, percent: float, max_tokens: float = 10.0):
+        self.ratio = percent / 100
+        self.max_tokens = max_tokens
+        self.tokens = 0.0
+
+    def deposit(self):
+        self.tokens = min(self.tokens + self.ratio, self.max_tokens)
+
+    def try_spend(self) -> bool:
+        if self.tokens >= 1.0:
+            self.tokens -= 1.0
+            return True
+        return False
@@ -0,0 +1,51 @@
+import base64
+import binascii
+import json
+from typing import List, Tuple
+
+
+def encode_cursor(offset: int, limit: int) -> str:
+    """
+    Opaque page cursor for the `next`/`prev` links. The Event service pages by
+    limit/offset only, so the cursor carries those; clients must treat it as opaque.
+    """
+    raw = json.dumps({"o": offset, "l": limit}, separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).rstrip(b"=").decode()
+
+
+def decode_cursor(cursor: str) -> Tuple[int, int]:
+    """
+    Returns (offset, limit) from a cursor made by encode_cursor(), or raises ValueError.
+    """
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        position = json.loads(raw)
+        offset, limit = int(position["o"]), int(position["l"])
+    except (binascii.Error, ValueError, TypeError, KeyError) as e:
+        raise ValueError("Invalid cursor") from e
+    if offset < 0 or limit < 1:
+        raise ValueError("Invalid cursor")
+    return offset, limit
+
+
+def page_info(limit: int, offset: int, has_next: bool) -> dict:
+    return {
+        "limit": limit,
+        "offset": offset,
+        "has_next": has_next,
+        "has_prev": offset > 0,
+        "next_cursor": encode_cursor(offset + limit, limit) if has_next else None,
+        "prev_cursor": encode_cursor(max(offset - limit, 0), limit) if offset > 0 else None,
+    }
+
+
+def page_links(path: str, pagination: dict) -> List[dict]:
+    """
+    `next`/`prev` HATEOAS links for a page_info() dict, addressed by cursor.
+    """
+    links = []
+    for rel in ("next", "prev"):
+        cursor = pagination[f"{rel}_cursor"]
+        if cursor is not None:
+            links.append({"rel": rel, "href": f"{path}?cursor={cursor}", "method": "GET"})
+    return links
@@ -0,0 +1,118 @@
+import time
+from contextvars import ContextVar
+from typing import Dict, List, Optional
+
+#Carries the remaining request budget in milliseconds, from clients and to upstreams.
+DEADLINE_HEADER = "X-Request-Timeout"
+
+
+class RequestContext:
+    """
+    Per-request state shared between the middleware and the service layer: upstream
+    time per microservice, validators of the upstream data used, and extra headers
+    to attach to the response.
+    """
+    __slots__ = ("started_at", "upstream_ms", "validators", "response_headers")
+
+    def __init__(self):
+        self.started_at = time.monotonic()
+        self.upstream_ms: Dict[str, float] = {}
+        self.validators: List[str] = []
+        self.response_headers: Dict[str, str] = {}
+
+    def record_upstream(self, upstream: str, duration_ms: float):
+        self.upstream_ms[upstream] = self.upstream_ms.get(upstream, 0.0) + duration_ms
+
+    def record_validator(self, validator: str):
+        self.validators.append(validator)
+
+    def server_timing(self) -> str:
+        """
+        Renders the Server-Timing header. Upstream durations are summed per service, so
+        concurrent calls can add up to more than the wall time; `local` is whatever
+        remains of the total.
+        """
+        total_ms = (time.monotonic() - self.started_at) * 1000
+        upstream_total = sum(self.upstream_ms.values())
+        entries = [f"{upstream};dur={duration:.2f}" for upstream, duration in self.upstream_ms.items()]
+        entries.append(f"local;dur={max(total_ms - upstream_total, 0.0):.2f}")
+        entries.append(f"total;dur={total_ms:.2f}")
+        return ", ".join(entries)
+
+
+_request_context: ContextVar[Optional[RequestContext]] = ContextVar("request_context", default=None)
+_deadline: ContextVar[Optional[float]] = ContextVar("request_deadline", default=None)
+_batch_memo: ContextVar[Optional[dict]] = ContextVar("batch_memo", default=None)
+_background: ContextVar[bool] = ContextVar("background", default=False)
+
+
+def current_context() -> Optional[RequestContext]:
+    return _request_context.get()
+
+
+def set_context(context: Optional[RequestContext]):
+    return _request_context.set(context)
+
+
+def reset_context(token):
+    _request_context.reset(token)
+
+
+def set_deadline(deadline: Optional[float]):
+    """
+    Sets the time.monotonic() instant by which the current request must be answered.
+    """
+    return _deadline.set(deadline)
+
+
+def reset_deadline(token):
+    _deadline.reset(token)
+
+
+def current_deadline() -> Optional[float]:
+    return _deadline.get()
+
+
+def detach_deadline():
+    """
+    Clears the deadline for work that outlives the response, e.g. background tasks.
+    """
+    _deadline.set(None)
+
+
+def remaining_budget() -> Optional[float]:
+    """
+    Seconds left before the current request's deadline, or None when there is none.
+    """
+    deadline = _deadline.get()
+    if deadline is None:
+        return None
+    return deadline - time.monotonic()
+
+
+def set_batch_memo(memo: Optional[dict]):
+    """
+    Shares `memo` between the sub-requests of one POST /composite/batch so identical
+    upstream GETs across the batch are made once.
+    """
+    return _batch_memo.set(memo)
+
+
+def reset_batch_memo(token):
+    _batch_memo.reset(token)
+
+
+def current_batch_memo() -> Optional[dict]:
+    return _batch_memo.get()
+
+
+def mark_background():
+    """
+    Marks the current task as background work, e.g. notification fan-out, so its
+    upstream calls go through the background bulkheads.
+    """
+    _background.set(True)
+
+
+def is_background() -> bool:
+    return _background.get()
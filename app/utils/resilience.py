@@ -0,0 +1,168 @@
+import asyncio
+import time
+from collections import deque
+
+import httpx
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+
+class UpstreamUnavailableError(httpx.HTTPStatusError):
+    """
+    Raised instead of calling an upstream that is known to be failing or saturated.
+
+    It carries a synthetic 503 response, so the routers' existing
+    `except httpx.HTTPStatusError` handling answers 503 with the reason.
+    """
+
+    def __init__(self, upstream: str, reason: str, method: str, url: str, status_code: int = 503):
+        request = httpx.Request(method, url)
+        response = httpx.Response(
+            status_code,
+            json={"message": f"{upstream} service unavailable: {reason}"},
+            request=request,
+        )
+        super().__init__(f"{upstream} service unavailable: {reason}", request=request, response=response)
+        self.upstream = upstream
+        self.reason = reason
+
+
+class UpstreamTimeoutError(UpstreamUnavailableError):
+    """
+    Raised when an upstream call runs out of time, either its own timeout or the
+    remaining request deadline. Surfaces as a 504.
+    """
+
+    def __init__(self, upstream: str, reason: str, method: str, url: str):
+        super().__init__(upstream, reason, method, url, status_code=504)
+
+
+class CircuitBreaker:
+    """
+    Closed/open/half-open breaker over a sliding window of the last `window_size` calls.
+
+    The breaker opens when, over at least `minimum_calls`, the share of failed calls or
+    of calls slower than `slow_call_duration` reaches its threshold. After
+    `open_duration` seconds it lets `half_open_calls` trial calls through: if they all
+    succeed it closes again, and any failed or slow trial re-opens it.
+    """
+
+    def __init__(self, name: str, window_size: int, minimum_calls: int, failure_rate_threshold: float,
+                 slow_call_duration: float, slow_call_rate_threshold: float, open_duration: float,
+                 half_open_calls: int):
+        self.name = name
+        self.minimum_calls = minimum_calls
+        self.failure_rate_threshold = failure_rate_threshold
+        self.slow_call_duration = slow_call_duration
+        self.slow_call_rate_threshold = slow_call_rate_threshold
+        self.open_duration = open_duration
+        self.half_open_calls = half_open_calls
+
+        self.state = CLOSED
+        self.opened_at = 0.0
+        self._outcomes = deque(maxlen=window_size)
+        self._trials_in_flight = 0
+        self._trial_successes = 0
+
+    def allow(self) -> bool:
+        if self.state == OPEN:
+            if time.monotonic() - self.opened_at < self.open_duration:
+                return False
+            self.state = HALF_OPEN
+            self._trials_in_flight = 0
+            self._trial_successes = 0
+        if self.state == HALF_OPEN:
+            if self._trials_in_flight >= self.half_open_calls:
+                return False
+            self._trials_in_flight += 1
+        return True
+
+    def record(self, failed: bool, duration: float):
+        slow = duration >= self.slow_call_duration
+        if self.state == HALF_OPEN:
+            self._trials_in_flight = max(self._trials_in_flight - 1, 0)
+            if failed or slow:
+                self._open()
+            else:
+                self._trial_successes += 1
+                if self._trial_successes >= self.half_open_calls:
+                    self._close()
+            return
+        if self.state == OPEN:
+            return
+
+        self._outcomes.append((failed, slow))
+        if len(self._outcomes) >= self.minimum_calls:
+            failure_rate, slow_call_rate = self._rates()
+            if failure_rate >= self.failure_rate_threshold or slow_call_rate >= self.slow_call_rate_threshold:
+                self._open()
+
+    def release(self):
+        """
+        Gives back a half-open trial slot for a call that ended without an outcome (e.g. cancelled).
+        """
+        if self.state == HALF_OPEN:
+            self._trials_in_flight = max(self._trials_in_flight - 1, 0)
+
+    def snapshot(self) -> dict:
+        failure_rate, slow_call_rate = self._rates()
+        return {
+            "state": self.state,
+            "calls": len(self._outcomes),
+            "failure_rate": round(failure_rate, 3),
+            "slow_call_rate": round(slow_call_rate, 3),
+        }
+
+    def _rates(self):
+        if not self._outcomes:
+            return 0.0, 0.0
+        failures = sum(1 for failed, _ in self._outcomes if failed)
+        slow_calls = sum(1 for _, slow in self._outcomes if slow)
+        return failures / len(self._outcomes), slow_calls / len(self._outcomes)
+
+    def _open(self):
+        self.state = OPEN
+        self.opened_at = time.monotonic()
+        self._outcomes.clear()
+
+    def _close(self):
+        self.state = CLOSED
+        self._outcomes.clear()
+
+
+class Bulkhead:
+    """
+    Caps concurrent calls to one upstream. A caller that cannot get a slot within
+    `max_wait` seconds is rejected instead of queueing behind a slow dependency.
+    """
+
+    def __init__(self, max_concurrent: int, max_wait: float):
+        self.max_concurrent = max_concurrent
+        self.max_wait = max_wait
+        self.in_use = 0
+        self.rejected = 0
+        self._semaphore = asyncio.Semaphore(max_concurrent)
+
+    async def acquire(self) -> bool:
+        if not self._semaphore.locked():
+            await self._semaphore.acquire()
+        elif self.max_wait <= 0:
+            self.rejected += 1
+            return False
+        else:
+            try:
+                await asyncio.wait_for(self._semaphore.acquire(), timeout=self.max_wait)
+            except asyncio.TimeoutError:
+                self.rejected += 1
+                return False
+        self.in_use += 1
+        return True
+
+    def release(self):
+        self.in_use -= 1
+        self._semaphore.release()
+
+    def snapshot(self) -> dict:
+        return {"in_use": self.in_use, "max_concurrent": self.max_concurrent, "rejected": self.rejected}
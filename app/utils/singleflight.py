@@ -0,0 +1,67 @@
+import asyncio
+from typing import Any, Awaitable, Callable, Dict, Hashable, Optional
+
+
+class _Call:
+    __slots__ = ("future", "deadline", "waiters")
+
+    def __init__(self, future: asyncio.Future, deadline: Optional[float]):
+        self.future = future
+        self.deadline = deadline
+        self.waiters = 0
+
+    def covers(self, deadline: Optional[float]) -> bool:
+        return self.deadline is None or (deadline is not None and self.deadline >= deadline)
+
+
+class SingleFlight:
+    """
+    Coalesces concurrent calls that share a key into one in-flight task.
+
+    Only calls that overlap in time are shared, so no result outlives its request.
+    A caller only joins an in-flight call whose deadline is at least as late as its
+    own, otherwise it starts a fresh one; so each shared task runs under the latest
+    deadline among its waiters. A caller that is cancelled stops waiting, and the
+    shared task is cancelled once its last waiter has gone.
+    """
+
+    def __init__(self):
+        self._calls: Dict[Hashable, _Call] = {}
+        self.shared = 0
+
+    async def do(self, key: Hashable, fn: Callable[[], Awaitable[Any]], deadline: Optional[float] = None) -> Any:
+        """
+        `deadline` is the caller's time.monotonic() deadline, or None when it has none;
+        `fn` runs in the starting caller's context, so it sees that caller's deadline.
+        """
+        call = self._calls.get(key)
+        if call is None or not call.covers(deadline):
+            call = self._calls[key] = _Call(asyncio.ensure_future(fn()), deadline)
+            call.future.add_done_callback(lambda f, call=call: self._forget(key, call))
+        else:
+            self.shared += 1
+        call.waiters += 1
+        try:
+            return await asyncio.shield(call.future)
+        finally:
+            call.waiters -= 1
+            if call.waiters == 0 and not call.future.done():
+                call.future.cancel()
+
+    def _forget(self, key: Hashable, call: _Call):
+        if self._calls.get(key) is call:
+            del self._calls[key]
+        if not call.future.cancelled():
+            # Marks the exception as retrieved when every waiter has gone away.
+            call.future.exception()
+
+    def forget(self, predicate: Callable[[Hashable], bool]):
+        """
+        Detaches matching in-flight calls so later callers start a fresh one, e.g. after
+        a write that the in-flight reads may predate. Existing waiters are unaffected.
+        """
+        for key in [key for key in self._calls if predicate(key)]:
+            del self._calls[key]
+
+    def in_flight(self) -> int:
+        return len(self._calls)
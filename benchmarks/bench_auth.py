@@ -0,0 +1,60 @@
+"""
+Microbenchmark for per-request auth cost.
+
+Before: AuthMiddleware decoded the token, then the router's validate_token decoded it
+again as 'user' and, for organiser tokens, a third time as 'organiser'.
+After: AuthMiddleware verifies once through the TokenVerifier LRU and handlers read the
+claims from request.state.
+
+    python -m benchmarks.bench_auth
+"""
+import os
+import time
+import timeit
+
+os.environ.setdefault("JWT_SECRET_KEY", "bench-auth-secret")
+
+import jwt
+
+from app.utils.auth import TokenVerifier
+from app.utils.config import Config
+
+config = Config()
+ITERATIONS = 20000
+
+
+def make_token(profile: str) -> str:
+    claims = {"email": f"{profile}@example.com", "profile": profile, "exp": int(time.time()) + 3600}
+    return jwt.encode(claims, config.JWT_SECRET_KEY, algorithm=config.JWT_ALGORITHM)
+
+
+def auth_before(token: str):
+    jwt.decode(token, key=config.JWT_SECRET_KEY, algorithms=[config.JWT_ALGORITHM])
+    claims = jwt.decode(token, key=config.JWT_SECRET_KEY, algorithms=[config.JWT_ALGORITHM])
+    if claims.get("profile") != "user":
+        claims = jwt.decode(token, key=config.JWT_SECRET_KEY, algorithms=[config.JWT_ALGORITHM])
+    return claims
+
+
+def auth_after(verifier: TokenVerifier, token: str):
+    claims = verifier.verify(token)
+    return claims.get("profile") in ("user", "organiser")
+
+
+def report(label: str, seconds: float):
+    print(f"{label:<40} {seconds / ITERATIONS * 1e6:8.2f} us/request")
+
+
+def main():
+    for profile in ("user", "organiser"):
+        token = make_token(profile)
+        warm = TokenVerifier(config.JWT_SECRET_KEY, config.JWT_ALGORITHM, config.AUTH_CACHE_SIZE)
+        cold = TokenVerifier(config.JWT_SECRET_KEY, config.JWT_ALGORITHM, 0)
+
+        report(f"before ({profile} token)", timeit.timeit(lambda: auth_before(token), number=ITERATIONS))
+        report(f"after, cache miss ({profile} token)", timeit.timeit(lambda: auth_after(cold, token), number=ITERATIONS))
+        report(f"after, cache hit ({profile} token)", timeit.timeit(lambda: auth_after(warm, token), number=ITERATIONS))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,111 @@
+"""
+Requests/sec through the middleware stack, BaseHTTPMiddleware vs pure ASGI.
+
+Both stacks run the same Auth and Logging behaviour in front of the real events router,
+with the CompositeService replaced by an in-memory stub so only gateway overhead is measured.
+
+    python -m benchmarks.bench_middleware
+"""
+import asyncio
+import logging
+import os
+import time
+
+os.environ.setdefault("JWT_SECRET_KEY", "bench-middleware-secret")
+
+import httpx
+import jwt
+from fastapi import FastAPI
+from starlette.middleware.base import BaseHTTPMiddleware
+from starlette.requests import Request
+from starlette.responses import JSONResponse
+
+from app.middleware.auth import AuthMiddleware, is_excluded
+from app.middleware.logging import LoggingMiddleware, logger
+from app.routers import events
+from app.utils.auth import token_verifier
+from app.utils.config import Config
+from app.utils.dependencies import get_composite_service
+
+config = Config()
+REQUESTS = 3000
+CONCURRENCY = 50
+
+
+class LegacyAuthMiddleware(BaseHTTPMiddleware):
+    async def dispatch(self, request: Request, call_next):
+        if request.method == "OPTIONS" or is_excluded(request.url.path):
+            return await call_next(request)
+        auth_header = request.headers.get("Authorization")
+        if not auth_header or not auth_header.startswith("Bearer "):
+            return JSONResponse(status_code=401, content={"detail": "Missing or invalid Authorization header"})
+        token = auth_header.split(" ", 1)[1]
+        claims = token_verifier.verify(token)
+        request.state.token = token
+        request.state.claims = claims
+        request.state.profile = claims.get('profile')
+        return await call_next(request)
+
+
+class LegacyLoggingMiddleware(BaseHTTPMiddleware):
+    async def dispatch(self, request: Request, call_next):
+        start_time = time.time()
+        logger.info(f"Incoming request: {request.method} {request.url.path} from {request.client.host}")
+        response = await call_next(request)
+        process_time = (time.time() - start_time) * 1000
+        logger.info(f"Response: {response.status_code} for {request.method} {request.url.path} in {process_time:.2f}ms")
+        return response
+
+
+class StubCompositeService:
+    async def get_events_page(self, limit: int, offset: int, token: str):
+        return {"result": {"data": [{"EID": str(i), "name": f"Event {i}"} for i in range(offset, offset + limit)]}}, True
+
+
+def build_app(auth_middleware, logging_middleware) -> FastAPI:
+    app = FastAPI()
+    app.add_middleware(auth_middleware)
+    app.add_middleware(logging_middleware)
+    app.include_router(events.router)
+    app.dependency_overrides[get_composite_service] = StubCompositeService
+
+    @app.get("/")
+    async def read_root():
+        return {"message": "Welcome to the Composite Service!"}
+
+    return app
+
+
+async def measure(app: FastAPI, path: str, headers: dict) -> float:
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        semaphore = asyncio.Semaphore(CONCURRENCY)
+
+        async def one():
+            async with semaphore:
+                response = await client.get(path, headers=headers)
+                assert response.status_code == 200, response.text
+
+        await one()
+        start = time.perf_counter()
+        await asyncio.gather(*(one() for _ in range(REQUESTS)))
+        return REQUESTS / (time.perf_counter() - start)
+
+
+async def main():
+    logger.handlers = [logging.NullHandler()]
+    token = jwt.encode({"profile": "user", "exp": int(time.time()) + 3600}, config.JWT_SECRET_KEY, algorithm=config.JWT_ALGORITHM)
+    headers = {"Authorization": f"Bearer {token}"}
+
+    stacks = {
+        "BaseHTTPMiddleware": build_app(LegacyAuthMiddleware, LegacyLoggingMiddleware),
+        "pure ASGI": build_app(AuthMiddleware, LoggingMiddleware),
+    }
+    for path in ("/", "/composite/events"):
+        for label, app in stacks.items():
+            rps = await measure(app, path, headers)
+            print(f"{path:<20} {label:<20} {rps:10.0f} req/s")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
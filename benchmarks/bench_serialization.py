@@ -0,0 +1,79 @@
+"""
+Microbenchmark for serializing large HATEOAS responses.
+
+Before: the route built HATEOASLink/HATEOASResponse models, FastAPI validated them again
+against response_model=HATEOASResponse, ran jsonable_encoder and encoded the result
+with the stdlib json module.
+After: the route renders precomputed LinkTemplates into a plain hateoas_envelope() and
+returns it as a HATEOASJSONResponse (orjson when installed), skipping validation.
+
+    python -m benchmarks.bench_serialization
+"""
+import asyncio
+import time
+
+from fastapi.responses import JSONResponse
+from fastapi.routing import serialize_response
+from fastapi.utils import create_model_field
+
+from app.models.response import HATEOASJSONResponse, HATEOASLink, HATEOASResponse, LinkTemplate, hateoas_envelope, orjson
+
+SIZES = (100, 1000, 10000)
+LINKS = LinkTemplate(
+    ("self", "/composite/events?limit={limit}&offset={offset}", "GET"),
+    ("create", "/composite/events", "POST"),
+)
+RESPONSE_FIELD = create_model_field(name="Response_get_all_composite_events", type_=HATEOASResponse, mode="serialization")
+
+
+def make_events(count: int) -> dict:
+    return {"result": {"data": [
+        {
+            "EID": str(i),
+            "name": f"Event {i}",
+            "description": "A reasonably long description of the event, its venue and its schedule. " * 2,
+            "date": "2025-05-01T19:30:00Z",
+            "guests_remaining": 100 - i % 100,
+            "OID": f"org-{i % 17}",
+            "tags": ["music", "outdoor", "family"],
+        }
+        for i in range(count)
+    ]}}
+
+
+async def serialize_before(events: dict, limit: int, offset: int) -> bytes:
+    links = [
+        HATEOASLink(rel="self", href=f"/composite/events?limit={limit}&offset={offset}", method="GET"),
+        HATEOASLink(rel="create", href="/composite/events", method="POST"),
+    ]
+    model = HATEOASResponse(data=events, message="Events retrieved successfully", links=links)
+    content = await serialize_response(field=RESPONSE_FIELD, response_content=model)
+    return JSONResponse(content).body
+
+
+async def serialize_after(events: dict, limit: int, offset: int) -> bytes:
+    links = LINKS.render(limit=limit, offset=offset)
+    return HATEOASJSONResponse(hateoas_envelope(events, "Events retrieved successfully", links)).body
+
+
+async def seconds_per_call(serialize, events: dict, number: int) -> float:
+    start = time.perf_counter()
+    for _ in range(number):
+        await serialize(events, 10, 0)
+    return (time.perf_counter() - start) / number
+
+
+async def main():
+    print(f"encoder: {'orjson' if orjson is not None else 'json (orjson not installed)'}")
+    for size in SIZES:
+        events = make_events(size)
+        number = max(10000 // size, 3)
+        before = await seconds_per_call(serialize_before, events, number)
+        after = await seconds_per_call(serialize_after, events, number)
+        body = await serialize_after(events, 10, 0)
+        print(f"{size:>6} events  before {before * 1000:9.2f} ms  after {after * 1000:8.2f} ms  "
+              f"({before / after:.1f}x, {len(body) / 1024:.0f} KiB)")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,158 @@
+"""
+End-to-end load test of the composite gateway against in-process stub microservices.
+
+Serves app.main:app with uvicorn on a local port, points the CompositeService at stub
+User, Event and Ticket services (benchmarks/stub_services.py) and at the stub AWS
+clients, then drives a weighted mix of realistic calls and reports RPS, p50/p99
+latency per scenario and the calls each upstream received.
+
+    python -m benchmarks.loadtest --requests 5000 --concurrency 100 --median-ms 20 --p99-ms 150
+"""
+import argparse
+import asyncio
+import os
+import random
+import socket
+import statistics
+import time
+from collections import defaultdict
+
+os.environ.setdefault("AWS_STUB_CLIENTS", "true")
+os.environ.setdefault("SEND_EMAIL_LAMBDA_FUNCTION_NAME", "loadtest-send-email")
+os.environ.setdefault("EVENT_UPDATED_SNS_TOPIC_ARN", "arn:aws:sns:us-east-1:000000000000:loadtest")
+os.environ.setdefault("LOG_SAMPLE_RATE", "0")
+os.environ.setdefault("JWT_SECRET_KEY", "loadtest-secret")
+
+import httpx
+import jwt
+import uvicorn
+
+from app.main import app
+from app.services.composite_service import CompositeService
+from app.utils.config import Config
+from benchmarks.stub_services import Behaviour, build_stub_services
+
+config = Config()
+
+SCENARIOS = {
+    "browse_events": 50,
+    "event_details": 20,
+    "tickets_and_events": 15,
+    "book_ticket": 10,
+    "update_event": 5,
+}
+
+
+def make_token(profile: str) -> str:
+    claims = {"email": f"{profile}@example.com", "profile": profile, "exp": int(time.time()) + 3600}
+    return jwt.encode(claims, config.JWT_SECRET_KEY, algorithm=config.JWT_ALGORITHM)
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def percentile(samples, q: float) -> float:
+    if not samples:
+        return 0.0
+    ordered = sorted(samples)
+    return ordered[min(int(len(ordered) * q), len(ordered) - 1)]
+
+
+async def run_scenario(client: httpx.AsyncClient, name: str, user_headers: dict, organiser_headers: dict, events: int):
+    eid = str(random.randrange(events))
+    if name == "browse_events":
+        return await client.get(f"/composite/events?limit=10&offset={random.randrange(0, 100, 10)}", headers=user_headers)
+    if name == "event_details":
+        return await client.get(f"/composite/events/{eid}", headers=user_headers)
+    if name == "tickets_and_events":
+        return await client.get(f"/composite/ticket/user/user-{random.randrange(1000)}/all", headers=user_headers)
+    if name == "book_ticket":
+        booking = {"EID": eid, "event_name": f"Event {eid}", "num_guests": 2, "user_email": "user@example.com"}
+        return await client.post("/composite/ticket/", json=booking, headers=user_headers)
+    if name == "update_event":
+        return await client.put("/composite/events", json={"EID": eid, "name": f"Event {eid}"}, headers=organiser_headers)
+    raise ValueError(name)
+
+
+async def main(args):
+    random.seed(args.seed)
+    stubs = build_stub_services(
+        Behaviour(args.median_ms, args.p99_ms, args.error_rate), events=args.events, attendees=args.attendees
+    )
+    service = CompositeService(transports={name: stub.transport() for name, stub in stubs.items()})
+    await service.start()
+    app.state.composite_service = service
+
+    port = free_port()
+    server = uvicorn.Server(uvicorn.Config(app, host="127.0.0.1", port=port, lifespan="off", access_log=False, log_level="warning"))
+    server_task = asyncio.ensure_future(server.serve())
+    while not server.started:
+        await asyncio.sleep(0.01)
+
+    user_headers = {"Authorization": f"Bearer {make_token('user')}"}
+    organiser_headers = {"Authorization": f"Bearer {make_token('organiser')}"}
+    names, weights = zip(*SCENARIOS.items())
+    latencies = defaultdict(list)
+    statuses = defaultdict(lambda: defaultdict(int))
+
+    # One single-connection client per worker keeps the driver's own pooling cost out of the numbers.
+    remaining = args.requests
+
+    async def worker():
+        nonlocal remaining
+        async with httpx.AsyncClient(base_url=f"http://127.0.0.1:{port}", timeout=30) as client:
+            while remaining > 0:
+                remaining -= 1
+                name = random.choices(names, weights)[0]
+                start = time.perf_counter()
+                try:
+                    response = await run_scenario(client, name, user_headers, organiser_headers, args.events)
+                    status = response.status_code
+                except httpx.HTTPError as e:
+                    status = type(e).__name__
+                latencies[name].append((time.perf_counter() - start) * 1000)
+                statuses[name][status] += 1
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(args.concurrency)))
+    elapsed = time.perf_counter() - started
+
+    server.should_exit = True
+    await server_task
+    await service.close()
+
+    all_latencies = [value for values in latencies.values() for value in values]
+    print(f"{args.requests} requests in {elapsed:.2f}s -> {args.requests / elapsed:.0f} req/s "
+          f"(p50 {percentile(all_latencies, 0.5):.1f}ms, p99 {percentile(all_latencies, 0.99):.1f}ms)")
+    print(f"\n{'scenario':<20}{'count':>8}{'mean':>10}{'p50':>10}{'p99':>10}  statuses")
+    for name in names:
+        values = latencies[name]
+        if values:
+            print(f"{name:<20}{len(values):>8}{statistics.mean(values):>9.1f}ms{percentile(values, 0.5):>8.1f}ms"
+                  f"{percentile(values, 0.99):>8.1f}ms  {dict(statuses[name])}")
+    print("\nupstream calls")
+    for name, stub in stubs.items():
+        print(f"  {name:<8} {sum(stub.calls.values()):>7}  {dict(stub.calls)}")
+    print(f"\nlambda invocations {len(service.lambda_client.calls)}, sns calls {len(service.sns_client.calls)}")
+    print(f"outbox {service.outbox.stats()}")
+    print(f"event cache {service.event_cache.stats()}")
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--concurrency", type=int, default=50)
+    parser.add_argument("--median-ms", type=float, default=20.0, help="median upstream latency")
+    parser.add_argument("--p99-ms", type=float, default=100.0, help="p99 upstream latency")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="fraction of upstream calls answering 503")
+    parser.add_argument("--events", type=int, default=500)
+    parser.add_argument("--attendees", type=int, default=250, help="attendees per event for update fan-out")
+    parser.add_argument("--seed", type=int, default=1)
+    return parser.parse_args()
+
+
+if __name__ == "__main__":
+    asyncio.run(main(parse_args()))
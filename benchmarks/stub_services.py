@@ -0,0 +1,110 @@
+"""
+In-process stand-ins for the User, Event and Ticket microservices.
+
+Each stub is a Starlette app served through httpx.ASGITransport, with a configurable
+latency distribution and error rate, and it counts every call it receives.
+"""
+import asyncio
+import math
+import random
+from collections import Counter
+from typing import Dict
+
+import httpx
+from starlette.applications import Starlette
+from starlette.requests import Request
+from starlette.responses import JSONResponse
+from starlette.routing import Route
+
+
+class Behaviour:
+    """
+    Latency is drawn from a log-normal distribution with the given median and p99;
+    `error_rate` of calls answer 503.
+    """
+
+    def __init__(self, median_ms: float = 20.0, p99_ms: float = 100.0, error_rate: float = 0.0):
+        self.median_ms = median_ms
+        self.error_rate = error_rate
+        # p99 of a log-normal is median * exp(2.326 * sigma)
+        self.sigma = math.log(max(p99_ms, median_ms) / median_ms) / 2.326 if median_ms > 0 else 0.0
+
+    async def apply(self):
+        if self.median_ms > 0:
+            await asyncio.sleep(random.lognormvariate(math.log(self.median_ms), self.sigma) / 1000)
+        if self.error_rate and random.random() < self.error_rate:
+            return JSONResponse({"message": "Simulated upstream failure"}, status_code=503)
+        return None
+
+
+class StubService:
+    def __init__(self, name: str, routes, behaviour: Behaviour):
+        self.name = name
+        self.behaviour = behaviour
+        self.calls: Counter = Counter()
+        self.app = Starlette(routes=[self._wrap(route) for route in routes] + [
+            Route("/health", self._wrap_endpoint("health", lambda request: {"status": "healthy"}), methods=["GET"]),
+        ])
+
+    def _wrap(self, route):
+        path, methods, name, handler = route
+        return Route(path, self._wrap_endpoint(name, handler), methods=methods)
+
+    def _wrap_endpoint(self, name, handler):
+        async def endpoint(request: Request):
+            self.calls[name] += 1
+            failure = await self.behaviour.apply()
+            if failure is not None:
+                return failure
+            result = handler(request)
+            if asyncio.iscoroutine(result):
+                result = await result
+            return result if isinstance(result, JSONResponse) else JSONResponse(result)
+        return endpoint
+
+    def transport(self) -> httpx.ASGITransport:
+        return httpx.ASGITransport(app=self.app)
+
+
+def _int(request: Request, name: str, default: int) -> int:
+    return int(request.query_params.get(name, default))
+
+
+def build_stub_services(behaviour: Behaviour, events: int = 500, attendees: int = 250,
+                        tickets_per_user: int = 5) -> Dict[str, StubService]:
+    def event(eid: str) -> dict:
+        return {"EID": eid, "name": f"Event {eid}", "guests_remaining": 100, "OID": "org-1"}
+
+    def list_events(request: Request):
+        limit, offset = _int(request, "limit", 10), _int(request, "offset", 0)
+        return {"result": {"data": [event(str(i)) for i in range(offset, min(offset + limit, events))]}}
+
+    async def update_event(request: Request):
+        return await request.json()
+
+    def users_by_event(request: Request):
+        limit, offset = _int(request, "limit", 10), _int(request, "offset", 0)
+        return {"uids": [{"UID": f"user-{i}"} for i in range(offset, min(offset + limit, attendees))]}
+
+    def tickets_by_user(request: Request):
+        uid = request.query_params.get("uid")
+        return {"tickets": [
+            {"TID": f"{uid}-{i}", "UID": uid, "EID": str(i % events), "num_guests": 1} for i in range(tickets_per_user)
+        ]}
+
+    user = StubService("user", [
+        ("/user/{uid}", ["GET"], "get_user",
+         lambda request: {"details": {"UID": request.path_params["uid"], "Email": f"{request.path_params['uid']}@example.com"}}),
+    ], behaviour)
+    event_service = StubService("event", [
+        ("/events", ["GET"], "get_all_events", list_events),
+        ("/events", ["PUT"], "update_event", update_event),
+        ("/events/{eid}", ["GET"], "get_event", lambda request: event(request.path_params["eid"])),
+    ], behaviour)
+    ticket = StubService("ticket", [
+        ("/ticket", ["GET"], "get_tickets_by_user", tickets_by_user),
+        ("/ticket", ["POST"], "book_ticket", lambda request: {"TID": f"T{random.randrange(10 ** 9)}"}),
+        ("/ticket/{tid}", ["GET"], "fetch_ticket", lambda request: {"TID": request.path_params["tid"], "EID": "1"}),
+        ("/ticket/event/{eid}/users", ["GET"], "get_users_by_event", users_by_event),
+    ], behaviour)
+    return {"user": user, "event": event_service, "ticket": ticket}